@@ -0,0 +1,187 @@
+"""Admission control for outbound LLM calls.
+
+Every AI request passes through one AIGateway: a per-client token bucket
+(429 when a client exceeds its budget), a global concurrency semaphore
+with a bounded wait queue (503 when the queue is full or the wait times
+out) and a deadline on the upstream call itself (504).
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+
+class GatewayRejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[int] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """A held concurrency slot; release() is idempotent."""
+
+    def __init__(self, gateway: "AIGateway", label: str = ""):
+        self.gateway = gateway
+        self.label = label
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.gateway.in_flight -= 1
+            self.gateway.semaphore.release()
+
+
+class TokenBuckets:
+    def __init__(self, rate_per_minute: float, burst: int, max_clients: int = 10000):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_clients = max_clients
+        self.buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def take(self, key: str) -> float:
+        """Consume one token for key; return 0 on success or seconds until one is available."""
+        now = time.monotonic()
+        tokens, last = self.buckets.get(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate if self.rate else float("inf")
+
+        self.buckets[key] = (tokens, now)
+        self.buckets.move_to_end(key)
+        while len(self.buckets) > self.max_clients:
+            self.buckets.popitem(last=False)
+        return wait
+
+
+class AIGateway:
+    def __init__(self, max_concurrency: int = 16, max_queue: int = 64, queue_timeout: float = 5.0,
+                 call_timeout: float = 30.0, rate_per_minute: float = 20, burst: int = 10,
+                 observer: Optional[Callable[[str, str, float], None]] = None):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.call_timeout = call_timeout
+        self.buckets = TokenBuckets(rate_per_minute, burst)
+
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.wait_seconds = 0.0
+        self.rejected = {"rate_limited": 0, "queue_full": 0, "queue_timeout": 0}
+        self.calls = {"ok": 0, "error": 0, "timeout": 0, "cancelled": 0}
+        self.upstream_seconds = 0.0
+        self.upstream_max = 0.0
+        # Called with (label, outcome, seconds) for every finished upstream call
+        self.observer = observer
+
+    async def admit(self, key: str, label: str = "") -> Ticket:
+        """Reserve a slot for key; the returned ticket must be released."""
+        wait = self.buckets.take(key)
+        if wait:
+            self.rejected["rate_limited"] += 1
+            raise GatewayRejected(429, "AI request limit reached, please try again later", retry_after=int(wait) + 1)
+
+        started = time.monotonic()
+        if not self.semaphore.locked():
+            await self.semaphore.acquire()
+        else:
+            if self.queued >= self.max_queue:
+                self.rejected["queue_full"] += 1
+                raise GatewayRejected(503, "AI service is busy, please try again", retry_after=1)
+
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self.semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected["queue_timeout"] += 1
+                raise GatewayRejected(503, "AI service is busy, please try again", retry_after=1)
+            finally:
+                self.queued -= 1
+
+        self.wait_seconds += time.monotonic() - started
+        self.admitted += 1
+        self.in_flight += 1
+        return Ticket(self, label)
+
+    def record(self, outcome: str, started: float, label: str = ""):
+        elapsed = time.monotonic() - started
+        self.calls[outcome] += 1
+        self.upstream_seconds += elapsed
+        self.upstream_max = max(self.upstream_max, elapsed)
+        if self.observer is not None:
+            self.observer(label, outcome, elapsed)
+
+    async def call(self, key: str, func: Callable[[], Awaitable], label: str = ""):
+        ticket = await self.admit(key, label)
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(func(), self.call_timeout)
+        except asyncio.TimeoutError:
+            self.record("timeout", started, label)
+            raise GatewayRejected(504, "AI service timed out")
+        except asyncio.CancelledError:
+            self.record("cancelled", started, label)
+            raise
+        except Exception:
+            self.record("error", started, label)
+            raise
+        else:
+            self.record("ok", started, label)
+            return result
+        finally:
+            ticket.release()
+
+    async def stream(self, ticket: Ticket, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Relay an admitted stream under the call deadline, releasing the ticket when it ends.
+
+        A stream that is never iterated does not reach this finally block, so
+        callers should also release the ticket once the response is done.
+        """
+        started = time.monotonic()
+        deadline = started + self.call_timeout
+        outcome = "ok"
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), remaining)
+                except StopAsyncIteration:
+                    break
+                yield chunk
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise GatewayRejected(504, "AI service timed out")
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            await chunks.aclose()
+            self.record(outcome, started, ticket.label)
+            ticket.release()
+
+    def stats(self) -> dict:
+        finished = sum(self.calls.values())
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "admitted": self.admitted,
+            "avg_wait_ms": round(self.wait_seconds / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "rejected": dict(self.rejected),
+            "calls": dict(self.calls),
+            "avg_upstream_ms": round(self.upstream_seconds / finished * 1000, 1) if finished else 0.0,
+            "max_upstream_ms": round(self.upstream_max * 1000, 1),
+        }
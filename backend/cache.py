@@ -0,0 +1,96 @@
+"""Bounded in-process LRU cache with per-entry TTL and single-flight loading.
+
+Read handlers wrap their DB work in ``get_or_load``; write handlers call
+``invalidate``/``invalidate_prefix`` for the keys they affect. Invalidating a
+key also detaches its in-flight load, so a result read before the write is
+handed to its waiters but never stored; loads for other keys are unaffected.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return default
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str):
+        self.entries.pop(key, None)
+        self.inflight.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str):
+        for key in [key for key in self.entries if key.startswith(prefix)]:
+            del self.entries[key]
+        for key in [key for key in self.inflight if key.startswith(prefix)]:
+            del self.inflight[key]
+
+    def clear(self):
+        self.entries.clear()
+        self.inflight.clear()
+
+    async def get_or_load(self, key: str, ttl: float, loader: Callable[[], Awaitable[Any]]) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            self.hits += 1
+            return value
+
+        # Concurrent misses for the same key share one load. It runs in its own
+        # task, so a waiter that is cancelled (the leader included) does not
+        # cancel it for the others.
+        task = self.inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(loader())
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._store(key, ttl, done))
+        return await asyncio.shield(task)
+
+    def _store(self, key: str, ttl: float, task: asyncio.Task):
+        # Reading the exception here keeps a load nobody awaits any more from logging it
+        failed = task.cancelled() or task.exception() is not None
+        # A load detached by an invalidation is not stored
+        if self.inflight.get(key) is not task:
+            return
+        del self.inflight[key]
+        if not failed:
+            self.set(key, task.result(), ttl)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
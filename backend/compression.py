@@ -0,0 +1,145 @@
+"""ASGI response compression with brotli/gzip negotiation.
+
+Brotli is preferred when the client accepts it, gzip otherwise. Bodies
+under ``minimum_size`` are sent as-is, and event streams, already
+encoded bodies and bodiless statuses are never compressed.
+
+The br, gzip and identity bytes of a response share the app's ETag, so a
+compressed response's ETag is made weak, and 304s to clients that
+negotiate an encoding carry the same weak ETag and ``Vary:
+Accept-Encoding`` as the full response would.
+"""
+import zlib
+from typing import Dict, Optional
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+
+SKIP_CONTENT_TYPES = ("text/event-stream",)
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    encodings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    encodings = accepted_encodings(header)
+    for name in ("br", "gzip"):
+        quality = encodings.get(name, encodings.get("*", 0.0))
+        if quality > 0:
+            return name
+    return None
+
+
+class Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            engine = brotli.Compressor(quality=brotli_quality)
+            self.compress_chunk = engine.process
+            self.flush = engine.flush
+            self.finish = engine.finish
+        else:
+            # wbits=31 selects the gzip container
+            engine = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self.compress_chunk = engine.compress
+            self.flush = lambda: engine.flush(zlib.Z_SYNC_FLUSH)
+            self.finish = engine.flush
+
+
+def mark_encoded_variant(headers: MutableHeaders):
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+    headers.add_vary_header("Accept-Encoding")
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    or content_type.startswith(SKIP_CONTENT_TYPES)
+                    or message["status"] in (204, 304)
+                    or message["status"] < 200
+                )
+                if passthrough:
+                    if message["status"] == 304 and "content-encoding" not in headers:
+                        mark_encoded_variant(MutableHeaders(raw=message["headers"]))
+                    await send(start_message)
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    # Too small to be worth the CPU; send the whole response untouched
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                mark_encoded_variant(headers)
+                if more_body:
+                    del headers["Content-Length"]
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressor.compress_chunk(body) + compressor.flush(), "more_body": True})
+                    return
+
+                compressed = compressor.compress_chunk(body) + compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            chunk = compressor.compress_chunk(body)
+            if more_body:
+                await send({"type": "http.response.body", "body": chunk + compressor.flush(), "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": chunk + compressor.finish()})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,77 @@
+"""MongoDB client settings and read routing.
+
+``client_options`` turns the MONGO_* settings into AsyncIOMotorClient
+keyword arguments; only the settings that are present are passed, so
+anything left unset falls back to the connection string and then to the
+driver defaults. Wire compression is opt-in through MONGO_COMPRESSORS,
+since it trades CPU on every command for bandwidth that only pays off on
+slow links. ``read_preference`` builds the preference used by the
+read-heavy list routes, which may be served by secondaries.
+"""
+import importlib.util
+from typing import List, Mapping, Optional
+
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+
+# Wire compressors, with the package each one needs
+COMPRESSOR_PACKAGES = {"zstd": "zstandard", "snappy": "snappy", "zlib": None}
+
+# Setting name -> AsyncIOMotorClient keyword
+CLIENT_INT_OPTIONS = {
+    "MONGO_MAX_POOL_SIZE": "maxPoolSize",
+    "MONGO_MIN_POOL_SIZE": "minPoolSize",
+    "MONGO_MAX_IDLE_TIME_MS": "maxIdleTimeMS",
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": "waitQueueTimeoutMS",
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": "serverSelectionTimeoutMS",
+    "MONGO_CONNECT_TIMEOUT_MS": "connectTimeoutMS",
+    "MONGO_SOCKET_TIMEOUT_MS": "socketTimeoutMS",
+}
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+# The server rejects maxStalenessSeconds below 90
+MIN_MAX_STALENESS_SECONDS = 90
+
+
+def available_compressors(names: str) -> List[str]:
+    """The requested compressors whose Python package is installed, in the given order."""
+    chosen = []
+    for name in (part.strip().lower() for part in names.split(",")):
+        if name not in COMPRESSOR_PACKAGES or name in chosen:
+            continue
+        package = COMPRESSOR_PACKAGES[name]
+        if package is None or importlib.util.find_spec(package) is not None:
+            chosen.append(name)
+    return chosen
+
+
+def client_options(settings: Mapping[str, str]) -> dict:
+    options = {"tz_aware": True}
+    for key, option in CLIENT_INT_OPTIONS.items():
+        value = settings.get(key)
+        if value:
+            options[option] = int(value)
+
+    compressors = available_compressors(settings.get("MONGO_COMPRESSORS", ""))
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
+def read_preference(mode: str, max_staleness_seconds: Optional[int] = None):
+    if mode not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference {mode!r}, expected one of {', '.join(READ_PREFERENCES)}")
+    if mode == "primary":
+        return Primary()
+
+    if max_staleness_seconds is None or max_staleness_seconds < 0:
+        return READ_PREFERENCES[mode]()
+    if max_staleness_seconds < MIN_MAX_STALENESS_SECONDS:
+        raise ValueError(f"maxStalenessSeconds must be at least {MIN_MAX_STALENESS_SECONDS}")
+    return READ_PREFERENCES[mode](max_staleness=max_staleness_seconds)
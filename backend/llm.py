@@ -0,0 +1,56 @@
+"""Chat construction and token streaming for the AI routes.
+
+With stub=True (LLM_STUB=true in server.py) the upstream model is
+replaced by FakeLlmChat, which answers locally so the AI endpoints can be
+exercised offline.
+"""
+import asyncio
+from typing import AsyncIterator
+
+from emergentintegrations.llm.chat import LlmChat, UserMessage
+
+STUB_TOKEN_DELAY = 0.02
+
+
+class FakeLlmChat:
+    """Offline stand-in with the LlmChat surface used by server.py."""
+
+    def __init__(self, api_key=None, session_id=None, system_message=None):
+        self.session_id = session_id
+        self.system_message = system_message
+
+    def with_model(self, provider, model):
+        return self
+
+    def reply_for(self, message: UserMessage) -> str:
+        return f"Bu, '{message.text[:40]}' isteği için yerel test yanıtıdır."
+
+    async def stream_message(self, message: UserMessage) -> AsyncIterator[str]:
+        for word in self.reply_for(message).split(" "):
+            await asyncio.sleep(STUB_TOKEN_DELAY)
+            yield word + " "
+
+    async def send_message(self, message: UserMessage) -> str:
+        return "".join([chunk async for chunk in self.stream_message(message)]).strip()
+
+
+def new_chat(session_id: str, system_message: str, api_key: str, provider: str, model: str, stub: bool = False):
+    if stub:
+        return FakeLlmChat(session_id=session_id, system_message=system_message)
+    return LlmChat(
+        api_key=api_key,
+        session_id=session_id,
+        system_message=system_message
+    ).with_model(provider, model)
+
+
+async def stream_reply(chat, message: UserMessage) -> AsyncIterator[str]:
+    # Use native token streaming when the client offers it; otherwise the whole
+    # reply arrives as a single chunk once the upstream call completes
+    stream_message = getattr(chat, "stream_message", None)
+    if stream_message is not None:
+        async for chunk in stream_message(message):
+            if chunk:
+                yield chunk
+    else:
+        yield await chat.send_message(message)
@@ -0,0 +1,119 @@
+"""Prometheus instrumentation for the API.
+
+MetricsMiddleware times every HTTP request by route template,
+MongoCommandMetrics is a pymongo CommandListener timing each command per
+collection, ``event_loop_lag_probe`` measures how late the loop wakes up,
+and ``observe_llm_call`` is the AIGateway observer for upstream LLM calls.
+``render`` produces the Prometheus text exposition served at /metrics.
+"""
+import asyncio
+import time
+from typing import Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from pymongo.monitoring import CommandListener
+
+# Mongo commands and loop stalls live well below the default HTTP buckets
+FINE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the last body chunk", ["method", "route"]
+)
+# The route is only known once the router has matched, so in-flight is global
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency as seen by the driver",
+    ["command", "collection", "outcome"], buckets=FINE_BUCKETS
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a scheduled wakeup", buckets=FINE_BUCKETS
+)
+LLM_CALL_LATENCY = Histogram(
+    "llm_call_duration_seconds", "Upstream LLM call latency by route and outcome",
+    ["route", "outcome"], buckets=LLM_BUCKETS
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = route_label(scope)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+
+
+def route_label(scope) -> str:
+    # Route templates keep label cardinality bounded; unknown paths share one label
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MongoCommandMetrics(CommandListener):
+    """Callbacks run on the driver's worker threads; the pending map is keyed per connection."""
+
+    def __init__(self):
+        self.pending = {}
+
+    @staticmethod
+    def key(event) -> Tuple:
+        return event.connection_id, event.request_id
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        collection = target if isinstance(target, str) else ""
+        self.pending[self.key(event)] = (event.command_name, collection)
+
+    def finish(self, event, outcome: str):
+        command_name, collection = self.pending.pop(self.key(event), (event.command_name, ""))
+        MONGO_COMMAND_LATENCY.labels(command_name, collection, outcome).observe(event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self.finish(event, "ok")
+
+    def failed(self, event):
+        self.finish(event, "error")
+
+
+async def event_loop_lag_probe(interval: float = 0.5):
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(loop.time() - scheduled, 0.0))
+
+
+def observe_llm_call(route: str, outcome: str, seconds: float):
+    LLM_CALL_LATENCY.labels(route or "unknown", outcome).observe(seconds)
+
+
+def render() -> Tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,124 @@
+"""Context windowing for AI prompts.
+
+Only the text around the selected term (explain) or the part of a draft
+related to the request (assist) is sent upstream, capped by an
+approximate token budget.
+"""
+import re
+from typing import List, Tuple
+
+from search_index import fold, tokenize
+
+# Turkish text averages roughly three characters per BPE token
+CHARS_PER_TOKEN = 3
+SENTENCE_RE = re.compile(r"[^.!?…\n]+(?:[.!?…]+|\n+|$)")
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+OMITTED = "[...]"
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def find_term(text: str, term: str) -> int:
+    """Offset of the first case- and diacritic-insensitive match of term, or -1."""
+    folded_term = fold(term).strip()
+    if not folded_term:
+        return -1
+
+    # Fold character by character so folded offsets map back to the original text
+    folded_chars = []
+    origins = []
+    for index, char in enumerate(text):
+        for folded_char in fold(char):
+            folded_chars.append(folded_char)
+            origins.append(index)
+    position = "".join(folded_chars).find(folded_term)
+    return origins[position] if position >= 0 else -1
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    return [match.span() for match in SENTENCE_RE.finditer(text) if match.group().strip()]
+
+
+def window_around(text: str, offset: int, budget: int) -> str:
+    """Grow outwards from the sentence containing offset until the budget is spent."""
+    if estimate_tokens(text) <= budget:
+        return text
+
+    max_chars = budget * CHARS_PER_TOKEN
+    spans = sentence_spans(text)
+    if not spans:
+        return text[:max_chars]
+
+    offset = min(max(offset, 0), len(text) - 1)
+    center = next((i for i, (start, end) in enumerate(spans) if start <= offset < end), 0)
+    start, end = spans[center]
+    if end - start > max_chars:
+        # A single sentence over budget: cut a character window around the term
+        start = max(start, offset - max_chars // 2)
+        return text[start:start + max_chars].strip()
+
+    before, after = center - 1, center + 1
+    while before >= 0 or after < len(spans):
+        grew = False
+        if before >= 0 and end - spans[before][0] <= max_chars:
+            start = spans[before][0]
+            before -= 1
+            grew = True
+        if after < len(spans) and spans[after][1] - start <= max_chars:
+            end = spans[after][1]
+            after += 1
+            grew = True
+        if not grew:
+            break
+    return text[start:end].strip()
+
+
+def relevant_section(draft: str, request: str, budget: int) -> str:
+    """Pick the paragraphs of draft that best match request, within budget.
+
+    Paragraphs sharing the most terms with the request are centered on;
+    without any overlap the end of the draft, where writing usually
+    continues, is kept.
+    """
+    if estimate_tokens(draft) <= budget:
+        return draft
+
+    max_chars = budget * CHARS_PER_TOKEN
+    paragraphs = [p.strip() for p in PARAGRAPH_RE.split(draft) if p.strip()]
+    if not paragraphs:
+        return draft.strip()[:max_chars]
+    request_terms = set(tokenize(request))
+    scores = [len(request_terms & set(tokenize(p))) for p in paragraphs]
+    best = max(scores) if scores else 0
+    center = scores.index(best) if best else len(paragraphs) - 1
+
+    if len(paragraphs[center]) > max_chars:
+        return window_around(paragraphs[center], 0 if best else len(paragraphs[center]) - 1, budget)
+
+    chosen = {center}
+    used = len(paragraphs[center])
+    before, after = center - 1, center + 1
+    while before >= 0 or after < len(paragraphs):
+        grew = False
+        if before >= 0 and used + len(paragraphs[before]) <= max_chars:
+            used += len(paragraphs[before])
+            chosen.add(before)
+            before -= 1
+            grew = True
+        if after < len(paragraphs) and used + len(paragraphs[after]) <= max_chars:
+            used += len(paragraphs[after])
+            chosen.add(after)
+            after += 1
+            grew = True
+        if not grew:
+            break
+
+    parts = []
+    for index, paragraph in enumerate(paragraphs):
+        if index in chosen:
+            parts.append(paragraph)
+        elif not parts or parts[-1] != OMITTED:
+            parts.append(OMITTED)
+    return "\n\n".join(parts)
@@ -0,0 +1,160 @@
+"""In-process inverted index used by /api/search.
+
+Documents are tokenized with Turkish-aware folding (dotted/dotless i,
+diacritics) and ranked with BM25. The last query token is matched as a
+prefix so typeahead queries hit while the user is still typing; short
+prefixes are bounded by how many documents their terms cover, most common
+terms first, rather than by how many terms they match. Expansions are
+cached per prefix until the next write, so a burst of keystrokes does not
+re-sort the same vocabulary range each time.
+"""
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+TURKISH_FOLD = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+TOKEN_RE = re.compile(r"\w+")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_PREFIX_DOCUMENTS = 1000
+MAX_CACHED_PREFIXES = 4096
+
+
+def fold(text: str) -> str:
+    # Map both Turkish i's before lower() so "I" does not become a dotted "i"
+    text = text.translate(TURKISH_FOLD).lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return TOKEN_RE.findall(fold(text))
+
+
+class SearchIndex:
+    def __init__(self, field_weights: Dict[str, float]):
+        self.field_weights = field_weights
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.doc_terms: Dict[str, Dict[str, float]] = {}
+        self.doc_len: Dict[str, float] = {}
+        self.sort_keys: Dict[str, str] = {}
+        self.vocabulary: List[str] = []
+        self.total_len = 0.0
+        self.expansions: Dict[str, List[str]] = {}
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def add(self, doc_id: str, doc: dict, sort_key: str = ""):
+        self.remove(doc_id)
+
+        terms: Dict[str, float] = defaultdict(float)
+        for field, weight in self.field_weights.items():
+            for token in tokenize(doc.get(field)):
+                terms[token] += weight
+        if not terms:
+            return
+
+        for term, tf in terms.items():
+            if term not in self.postings:
+                insort(self.vocabulary, term)
+            self.postings[term][doc_id] = tf
+        self.doc_terms[doc_id] = dict(terms)
+        self.doc_len[doc_id] = sum(terms.values())
+        self.sort_keys[doc_id] = sort_key
+        self.total_len += self.doc_len[doc_id]
+        self.expansions.clear()
+
+    def remove(self, doc_id: str):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            posting = self.postings[term]
+            posting.pop(doc_id, None)
+            if not posting:
+                del self.postings[term]
+                index = bisect_left(self.vocabulary, term)
+                if index < len(self.vocabulary) and self.vocabulary[index] == term:
+                    self.vocabulary.pop(index)
+        self.total_len -= self.doc_len.pop(doc_id)
+        self.sort_keys.pop(doc_id, None)
+        self.expansions.clear()
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        cached = self.expansions.get(prefix)
+        if cached is not None:
+            return cached
+
+        start = bisect_left(self.vocabulary, prefix)
+        end = bisect_left(self.vocabulary, prefix + "\U0010ffff", start)
+        # The exact term always counts; the rest go by document frequency
+        matches = sorted(
+            self.vocabulary[start:end], key=lambda term: (term != prefix, -len(self.postings[term]), term)
+        )
+
+        expansions = []
+        covered = 0
+        for term in matches:
+            if covered >= MAX_PREFIX_DOCUMENTS:
+                break
+            expansions.append(term)
+            covered += len(self.postings[term])
+
+        if len(self.expansions) >= MAX_CACHED_PREFIXES:
+            self.expansions.clear()
+        self.expansions[prefix] = expansions
+        return expansions
+
+    def bm25(self, term: str) -> Dict[str, float]:
+        posting = self.postings.get(term)
+        if not posting:
+            return {}
+
+        n_docs = len(self.doc_terms)
+        avg_len = self.total_len / n_docs if n_docs else 1.0
+        idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+        scores = {}
+        for doc_id, tf in posting.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[doc_id] / avg_len)
+            scores[doc_id] = idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, query: str) -> List[Tuple[str, float]]:
+        """Rank every document that matches all query tokens.
+
+        All tokens but the last must match a term exactly; the last one is
+        expanded to every indexed term it prefixes.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        totals: Optional[Dict[str, float]] = None
+        for position, token in enumerate(tokens):
+            candidates = [token]
+            if position == len(tokens) - 1:
+                candidates = self.expand_prefix(token)
+
+            token_scores: Dict[str, float] = {}
+            for term in candidates:
+                for doc_id, score in self.bm25(term).items():
+                    token_scores[doc_id] = max(token_scores.get(doc_id, 0.0), score)
+
+            if totals is None:
+                totals = token_scores
+            else:
+                totals = {doc_id: totals[doc_id] + score for doc_id, score in token_scores.items() if doc_id in totals}
+            if not totals:
+                return []
+
+        # Highest score first, newest document first among equal scores
+        ranked = sorted(totals.items(), key=lambda item: (item[1], self.sort_keys.get(item[0], "")), reverse=True)
+        return ranked
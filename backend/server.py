@@ -1,36 +1,219 @@
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure
 import os
+import json
+import base64
+import binascii
+import hashlib
 import logging
+import asyncio
+import orjson
+import time
+import socket
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from typing import List, Literal, Optional, Tuple, Union
 import uuid
 from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
 from jose import JWTError, jwt
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+from emergentintegrations.llm.chat import UserMessage
+from search_index import SearchIndex, fold
+from cache import ResponseCache
+from llm import new_chat, stream_reply
+from ai_gateway import AIGateway, GatewayRejected
+from prompt_context import find_term, relevant_section, window_around
+from compression import CompressionMiddleware
+from db_settings import client_options, read_preference
+from metrics import MetricsMiddleware, MongoCommandMetrics, event_loop_lag_probe, observe_llm_call, render as render_metrics
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+mongo_options = client_options(os.environ)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics()], **mongo_options)
 db = client[os.environ['DB_NAME']]
 
+# Feed, search and popular-games reads tolerate bounded staleness and may go
+# to secondaries; every other read, including those in write paths, stays on
+# the primary
+list_db = db.with_options(read_preference=read_preference(
+    os.environ.get('MONGO_LIST_READ_PREFERENCE', 'secondaryPreferred'),
+    int(os.environ.get('MONGO_LIST_MAX_STALENESS_SECONDS', 90))
+))
+
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes below BCRYPT_ROUNDS are flagged for update and rehashed on the next login
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=BCRYPT_ROUNDS, bcrypt__min_rounds=BCRYPT_ROUNDS)
+
+# bcrypt runs off the event loop in a bounded pool; past the queue limit
+# register/login shed load with 429 instead of piling up
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 4))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.environ.get('PASSWORD_HASH_QUEUE_LIMIT', 64))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+password_jobs = 0
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-here')
 JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM', 'HS256')
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get('ACCESS_TOKEN_EXPIRE_MINUTES', 10080))
 
 EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
+LLM_PROVIDER = os.environ.get('LLM_PROVIDER', 'openai')
+LLM_MODEL = os.environ.get('LLM_MODEL', 'gpt-5.2')
+# Answer AI requests from a local fake model (offline development and tests)
+LLM_STUB = os.environ.get('LLM_STUB', 'false').lower() == 'true'
+
+# Prompt context budgets, in approximate tokens
+EXPLAIN_CONTEXT_TOKENS = int(os.environ.get('EXPLAIN_CONTEXT_TOKENS', 160))
+ASSIST_CONTEXT_TOKENS = int(os.environ.get('ASSIST_CONTEXT_TOKENS', 1000))
+
+# Outbound LLM admission control shared by every AI route
+ai_gateway = AIGateway(
+    max_concurrency=int(os.environ.get('AI_MAX_CONCURRENCY', 16)),
+    max_queue=int(os.environ.get('AI_MAX_QUEUE', 64)),
+    queue_timeout=float(os.environ.get('AI_QUEUE_TIMEOUT', 5)),
+    call_timeout=float(os.environ.get('AI_CALL_TIMEOUT', 30)),
+    rate_per_minute=float(os.environ.get('AI_RATE_PER_MINUTE', 20)),
+    burst=int(os.environ.get('AI_RATE_BURST', 10)),
+    observer=observe_llm_call,
+)
+
+# Anonymous AI routes are budgeted per client IP. X-Forwarded-For is only
+# trusted for the hops our own proxies appended, counted from the right; leave
+# this at 0 when uvicorn already resolves the client (--proxy-headers with
+# --forwarded-allow-ips) or when nothing sits in front of it.
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+
+# How often the event-loop lag probe schedules a wakeup
+EVENT_LOOP_PROBE_INTERVAL = float(os.environ.get('EVENT_LOOP_PROBE_INTERVAL', 0.5))
+
+# Wrap multi-document writes in transactions (requires a replica set)
+USE_TRANSACTIONS = os.environ.get('USE_TRANSACTIONS', 'false').lower() == 'true'
+
+ADMIN_EMAILS = [e.strip().lower() for e in os.environ.get('ADMIN_EMAILS', '').split(',') if e.strip()]
+
+# Only the worker holding the rebuild lease recomputes game_stats; the lease
+# outlives two rebuild intervals so a dead holder is replaced promptly
+GAME_STATS_REBUILD_SECONDS = int(os.environ.get('GAME_STATS_REBUILD_SECONDS', 600))
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Each worker keeps its own search index and only applies the writes it
+# handles itself; a periodic rebuild picks up everyone else's (0 disables it,
+# which is only safe with a single worker)
+SEARCH_INDEX_REFRESH_SECONDS = int(os.environ.get('SEARCH_INDEX_REFRESH_SECONDS', 300))
+
+# Background jobs (review_deletions, rename_jobs) are polled this often and
+# kept this long after finishing
+JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', 60))
+JOB_RETENTION = int(os.environ.get('JOB_RETENTION', 7 * 24 * 3600))
+
+# Deleted reviews leave a tombstone in review_deletions; the reaper removes
+# their comments and likes in batches, pausing between batches
+REAPER_BATCH_SIZE = int(os.environ.get('REAPER_BATCH_SIZE', 500))
+REAPER_PAUSE_SECONDS = float(os.environ.get('REAPER_PAUSE_SECONDS', 0.05))
+
+# Username changes are copied onto the user's reviews and comments in batches
+RENAME_BATCH_SIZE = int(os.environ.get('RENAME_BATCH_SIZE', 500))
+RENAME_PAUSE_SECONDS = float(os.environ.get('RENAME_PAUSE_SECONDS', 0.1))
+
+# Response cache for hot read endpoints, TTLs in seconds per route
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+CACHE_TTLS = {
+    "reviews": float(os.environ.get('CACHE_TTL_REVIEWS', 15)),
+    "review": float(os.environ.get('CACHE_TTL_REVIEW', 60)),
+    "popular-games": float(os.environ.get('CACHE_TTL_POPULAR_GAMES', 60)),
+    "comments": float(os.environ.get('CACHE_TTL_COMMENTS', 30)),
+}
+response_cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES)
+
+# Resolved principals for get_current_user, keyed by user id. The TTL bounds
+# how stale a cached profile may be on nodes that did not handle the update.
+PRINCIPAL_CACHE_TTL = float(os.environ.get('PRINCIPAL_CACHE_TTL', 30))
+principal_cache = ResponseCache(max_entries=int(os.environ.get('PRINCIPAL_CACHE_MAX_ENTRIES', 10000)))
+
+# Until then other workers may still write a renamed user's old name, so a
+# rename is swept once more after the TTL plus a margin for in-flight requests
+RENAME_SWEEP_DELAY = PRINCIPAL_CACHE_TTL + float(os.environ.get('RENAME_SWEEP_MARGIN', 30))
+
+# Cache-Control per conditional GET route
+CACHE_CONTROL = {
+    "review": "public, max-age=10, must-revalidate",
+    "comments": "public, max-age=5, must-revalidate",
+    # Profiles include the email address, so only the user's own browser may keep them
+    "user": "private, max-age=60, must-revalidate",
+    "user-reviews": "public, max-age=30, must-revalidate",
+}
+
+# Comment pages: default and maximum page size
+COMMENTS_PAGE_SIZE = int(os.environ.get('COMMENTS_PAGE_SIZE', 50))
+COMMENTS_MAX_PAGE_SIZE = int(os.environ.get('COMMENTS_MAX_PAGE_SIZE', 200))
+
+# Upper bound on review ids per bulk like-status lookup
+LIKE_STATUS_MAX_IDS = int(os.environ.get('LIKE_STATUS_MAX_IDS', 100))
+
+# Word explanations are cached in Mongo (explanations) with an LRU in front
+EXPLAIN_CACHE_TTL = int(os.environ.get('EXPLAIN_CACHE_TTL', 7 * 24 * 3600))
+explain_cache = ResponseCache(max_entries=int(os.environ.get('EXPLAIN_CACHE_MAX_ENTRIES', 4096)))
+
+# Index declarations, created idempotently on startup
+INDEXES = {
+    "users": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("email", ASCENDING)], {"unique": True}),
+        ([("username", ASCENDING)], {"unique": True}),
+    ],
+    "reviews": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("created_at", DESCENDING), ("id", DESCENDING)], {}),
+        ([("category", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {}),
+        ([("author_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {}),
+    ],
+    "comments": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("review_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {}),
+        ([("author_id", ASCENDING), ("_id", ASCENDING)], {}),
+    ],
+    "game_stats": [
+        ([("popularity_score", DESCENDING)], {}),
+    ],
+    "explanations": [
+        ([("review_id", ASCENDING)], {}),
+        ([("created_at", ASCENDING)], {"expireAfterSeconds": EXPLAIN_CACHE_TTL}),
+    ],
+    "review_deletions": [
+        ([("status", ASCENDING), ("created_at", ASCENDING)], {}),
+        ([("finished_at", ASCENDING)], {"expireAfterSeconds": JOB_RETENTION}),
+    ],
+    "rename_jobs": [
+        ([("status", ASCENDING), ("created_at", ASCENDING)], {}),
+        ([("finished_at", ASCENDING)], {"expireAfterSeconds": JOB_RETENTION}),
+    ],
+    "likes": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("review_id", ASCENDING), ("user_id", ASCENDING)], {"unique": True}),
+        ([("user_id", ASCENDING), ("review_id", ASCENDING)], {}),
+    ],
+}
+
+# Search indexes, rebuilt on startup and every SEARCH_INDEX_REFRESH_SECONDS,
+# and kept in sync with this worker's writes by the write handlers
+review_index = SearchIndex({"title": 3.0, "game_name": 2.0, "author_username": 1.0})
+user_index = SearchIndex({"username": 1.0})
+rebuilding_indexes: Optional[Tuple[SearchIndex, SearchIndex]] = None
+REVIEW_INDEX_FIELDS = {"_id": 0, "id": 1, "title": 1, "game_name": 1, "author_username": 1, "created_at": 1}
 
 # Create the main app
 app = FastAPI()
@@ -72,6 +255,7 @@ class Review(BaseModel):
     content: str
     game_name: str
     category: str
+    excerpt: str = ""  # precomputed from content for list views
     tags: List[str] = []
     rating: Optional[int] = None  # 1-10
     cover_image: Optional[str] = None
@@ -80,9 +264,29 @@ class Review(BaseModel):
     collaborators: List[str] = []  # user IDs
     likes_count: int = 0
     comments_count: int = 0
+    version: int = 0  # bumped on every write, feeds the ETag
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class ReviewSummary(BaseModel):
+    # What feed cards render: the full review minus content and collaborators
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    title: str
+    excerpt: str = ""
+    game_name: str
+    category: str
+    tags: List[str] = []
+    rating: Optional[int] = None
+    cover_image: Optional[str] = None
+    author_id: str
+    author_username: str
+    likes_count: int = 0
+    comments_count: int = 0
+    version: int = 0
+    created_at: datetime
+    updated_at: datetime
+
 class ReviewCreate(BaseModel):
     title: str
     content: str
@@ -120,6 +324,9 @@ class Like(BaseModel):
     user_id: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class LikeStatusRequest(BaseModel):
+    review_ids: List[str] = Field(..., max_length=LIKE_STATUS_MAX_IDS)
+
 class AIAssistRequest(BaseModel):
     prompt: str
     context: Optional[str] = None
@@ -129,17 +336,36 @@ class AIAssistResponse(BaseModel):
 
 class WordExplainRequest(BaseModel):
     word: str
-    context: str
+    # Either the surrounding text, or review_id (plus optional offset of the
+    # selection in the review content) so the server reads it from the review
+    context: Optional[str] = None
+    review_id: Optional[str] = None
+    offset: Optional[int] = None
 
 class WordExplainResponse(BaseModel):
     explanation: str
 
 # Helper functions
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def run_password_job(func, *args):
+    global password_jobs
+    if password_jobs >= PASSWORD_HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many authentication requests, please try again",
+            headers={"Retry-After": "1"},
+        )
+    password_jobs += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(password_executor, func, *args)
+    finally:
+        password_jobs -= 1
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def verify_password(plain_password, hashed_password):
+    # Returns (valid, new_hash); new_hash is set when the stored hash needs upgrading
+    return await run_password_job(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash(password):
+    return await run_password_job(pwd_context.hash, password)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -148,6 +374,88 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
+EXCERPT_LENGTH = 280
+REVIEW_PROJECTIONS = {
+    "summary": {"_id": 0, **{field: 1 for field in ReviewSummary.model_fields}},
+    "full": {"_id": 0},
+}
+
+def make_excerpt(content: str) -> str:
+    text = " ".join(content.split())
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    cut = text.rfind(" ", 0, EXCERPT_LENGTH)
+    return text[:cut if cut > 0 else EXCERPT_LENGTH].rstrip(" .,;:") + "…"
+
+# Keyset pagination: the cursor encodes the (created_at, id) of the last
+# document on the page so the next page is an index range scan
+FEED_SORT = [("created_at", DESCENDING), ("id", DESCENDING)]
+
+def encode_cursor(doc: dict) -> str:
+    raw = json.dumps([doc['created_at'].isoformat(), doc['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        created_at, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = datetime.fromisoformat(created_at)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": last_id}}
+        ]
+    }
+
+async def fetch_page(collection, query: dict, skip: int, limit: int, cursor: Optional[str] = None,
+                     projection: Optional[dict] = None):
+    if cursor:
+        cursor_query = decode_cursor(cursor)
+        query = {"$and": [query, cursor_query]} if query else cursor_query
+    
+    find = collection.find(query, projection or {"_id": 0}).sort(FEED_SORT)
+    if not cursor:
+        find = find.skip(skip)
+    docs = await find.limit(limit).to_list(limit)
+    
+    next_cursor = encode_cursor(docs[-1]) if docs and len(docs) == limit else None
+    return docs, next_cursor
+
+# Conditional GET helpers
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+# Validation is ETag-only: likes, comments and collaborator changes bump a
+# review's version without touching updated_at, so no timestamp we store is a
+# sound Last-Modified
+def is_not_modified(request: Request, etag: str) -> bool:
+    # Weak comparison: compressed variants carry W/ ETags
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag.removeprefix('W/') in tags
+
+def conditional_response(request: Request, response: Response, route: str, etag: str) -> Optional[Response]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL[route]}
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+# List endpoints hand Mongo documents straight to orjson: they are written
+# from validated models, so re-validating them against response_model on
+# every read is pure overhead. response_model stays for the OpenAPI schema.
+def dump_json(content) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC)
+
+def json_body(body: bytes, response: Response) -> Response:
+    # A returned Response bypasses the injected one, so carry its headers over
+    headers = {k: v for k, v in response.headers.items() if k != 'content-length'}
+    return Response(content=body, media_type="application/json", headers=headers)
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -162,14 +470,436 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
     
-    user_doc = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
-    if user_doc is None:
-        raise credentials_exception
+    async def load_user():
+        user_doc = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
+        if user_doc is None:
+            raise credentials_exception
+        
+        return User(**user_doc)
+    
+    return await principal_cache.get_or_load(user_id, PRINCIPAL_CACHE_TTL, load_user)
+
+async def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[User]:
+    # Anonymous callers and stale tokens get the public view instead of a 401
+    if not token:
+        return None
+    try:
+        return await get_current_user(token)
+    except HTTPException:
+        return None
+
+async def get_admin_user(current_user: User = Depends(get_current_user)):
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+async def ensure_indexes():
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        for keys, options in indexes:
+            try:
+                await collection.create_index(keys, **options)
+            except OperationFailure as e:
+                # Existing duplicates block unique indexes; keep serving and report it
+                logger.error(f"Index creation failed on {collection_name} {keys}: {str(e)}")
+
+# Timestamps are stored as BSON dates; older documents carried ISO strings
+TIMESTAMP_FIELDS = {
+    "users": ["created_at"],
+    "reviews": ["created_at", "updated_at"],
+    "comments": ["created_at"],
+    "likes": ["created_at"],
+}
+MIGRATION_BATCH_SIZE = 1000
+
+async def migrate_timestamps():
+    # Idempotent: only documents still holding strings are touched
+    for collection_name, fields in TIMESTAMP_FIELDS.items():
+        collection = db[collection_name]
+        for field in fields:
+            migrated = 0
+            while True:
+                docs = await collection.find(
+                    {field: {"$type": "string"}}, {"_id": 1, field: 1}
+                ).limit(MIGRATION_BATCH_SIZE).to_list(MIGRATION_BATCH_SIZE)
+                if not docs:
+                    break
+                await collection.bulk_write([
+                    UpdateOne({"_id": doc['_id']}, {"$set": {field: datetime.fromisoformat(doc[field])}})
+                    for doc in docs
+                ], ordered=False)
+                migrated += len(docs)
+            if migrated:
+                logger.info(f"Migrated {migrated} {collection_name}.{field} timestamps to BSON dates")
+
+async def run_migration(name: str, migrate):
+    # One-off backfills run on every boot until one completes; the marker in
+    # migrations then spares later boots the collection scans
+    if await db.migrations.find_one({"_id": name}):
+        return
+    await migrate()
+    await db.migrations.update_one(
+        {"_id": name}, {"$set": {"finished_at": datetime.now(timezone.utc)}}, upsert=True
+    )
+
+async def adjust_review_count(category: str, delta: int, session=None):
+    await db.review_counts.update_one({"_id": category}, {"$inc": {"count": delta}}, upsert=True, session=session)
+
+async def backfill_excerpts():
+    # Reviews written before excerpts existed get one on first startup
+    while True:
+        docs = await db.reviews.find(
+            {"excerpt": {"$exists": False}}, {"_id": 1, "content": 1}
+        ).limit(MIGRATION_BATCH_SIZE).to_list(MIGRATION_BATCH_SIZE)
+        if not docs:
+            break
+        await db.reviews.bulk_write([
+            UpdateOne({"_id": doc['_id']}, {"$set": {"excerpt": make_excerpt(doc.get('content', ''))}})
+            for doc in docs
+        ], ordered=False)
+
+async def seed_review_counts():
+    # Per-category totals are maintained incrementally by the review write
+    # handlers; only rebuild them from scratch when the counter collection is empty
+    if await db.review_counts.estimated_document_count() > 0:
+        return
+    counts = await db.reviews.aggregate([{"$group": {"_id": "$category", "count": {"$sum": 1}}}]).to_list(None)
+    # Workers boot together and may all find the collection empty: seed each
+    # category with $setOnInsert so only the first seeder's count lands and a
+    # counter already being maintained is never overwritten or added to
+    for count in counts:
+        try:
+            await db.review_counts.update_one(
+                {"_id": count['_id']}, {"$setOnInsert": {"count": count['count']}}, upsert=True
+            )
+        except DuplicateKeyError:
+            # Another worker's upsert inserted the same category first
+            pass
+
+def live_search_indexes() -> List[Tuple[SearchIndex, SearchIndex]]:
+    # While a rebuild is scanning, local writes also go to the indexes it is
+    # building so they survive the swap
+    return [(review_index, user_index)] + ([rebuilding_indexes] if rebuilding_indexes else [])
+
+def index_review(review: dict):
+    for reviews, _ in live_search_indexes():
+        reviews.add(review['id'], review, str(review['created_at']))
+
+def unindex_review(review_id: str):
+    for reviews, _ in live_search_indexes():
+        reviews.remove(review_id)
+
+def index_user(user: dict):
+    for _, users in live_search_indexes():
+        users.add(user['id'], user, str(user['created_at']))
+
+async def build_search_indexes():
+    global review_index, user_index, rebuilding_indexes
+    reviews = SearchIndex(review_index.field_weights)
+    users = SearchIndex(user_index.field_weights)
+    rebuilding_indexes = (reviews, users)
+    try:
+        async for review in db.reviews.find({}, REVIEW_INDEX_FIELDS):
+            reviews.add(review['id'], review, str(review['created_at']))
+        async for user in db.users.find({}, {"_id": 0, "id": 1, "username": 1, "created_at": 1}):
+            users.add(user['id'], user, str(user['created_at']))
+    finally:
+        rebuilding_indexes = None
+    # Searches keep using the old indexes until the new ones are complete
+    review_index, user_index = reviews, users
+    logger.info(f"Search index built: {len(review_index)} reviews, {len(user_index)} users")
+
+async def search_index_refresh_loop():
+    while True:
+        await asyncio.sleep(SEARCH_INDEX_REFRESH_SECONDS)
+        try:
+            await build_search_indexes()
+        except Exception as e:
+            logger.error(f"Search index refresh error: {str(e)}")
+
+# Leases: named, expiring locks in the leases collection for periodic work
+# that should run on one worker at a time
+async def acquire_lease(name: str, ttl: float) -> bool:
+    now = datetime.now(timezone.utc)
+    try:
+        await db.leases.update_one(
+            {"_id": name, "$or": [{"holder": WORKER_ID}, {"expires_at": {"$lte": now}}]},
+            {"$set": {"holder": WORKER_ID, "expires_at": now + timedelta(seconds=ttl)}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # The filter missed because another worker holds the lease, so the
+        # upsert collided with its document
+        return False
+    return True
+
+# Popular games leaderboard, materialized in game_stats (one document per game_name)
+GAME_SCORE = {
+    "$add": [
+        {"$multiply": ["$review_count", 10]},
+        {"$multiply": ["$total_likes", 5]},
+        {"$multiply": [
+            {"$cond": [{"$gt": ["$rating_count", 0]}, {"$divide": ["$rating_sum", "$rating_count"]}, 0]},
+            2
+        ]}
+    ]
+}
+
+def game_stats_delta(review: dict, sign: int = 1) -> dict:
+    rating = review.get('rating')
+    return {
+        "review_count": sign,
+        "total_likes": sign * review.get('likes_count', 0),
+        "rating_sum": sign * (rating or 0),
+        "rating_count": sign * (1 if rating is not None else 0),
+    }
+
+async def update_game_stats(game_name: str, delta: dict, cover_image: Optional[str] = None):
+    fields = {name: {"$add": [{"$ifNull": [f"${name}", 0]}, value]} for name, value in delta.items()}
+    if cover_image:
+        fields['cover_image'] = {"$ifNull": ["$cover_image", cover_image]}
+    
+    await db.game_stats.update_one(
+        {"_id": game_name},
+        [{"$set": fields}, {"$set": {"popularity_score": GAME_SCORE}}],
+        upsert=True
+    )
+    if delta.get('review_count', 0) < 0:
+        await db.game_stats.delete_one({"_id": game_name, "review_count": {"$lte": 0}})
+
+async def rebuild_game_stats():
+    # Full recomputation from reviews, written back per game with absolute
+    # values: unlike $out this does not replace the collection, so deltas from
+    # update_game_stats land on the rebuilt documents rather than being lost
+    rebuilt_at = datetime.now(timezone.utc)
+    await db.reviews.aggregate([
+        {
+            "$group": {
+                "_id": "$game_name",
+                "review_count": {"$sum": 1},
+                "total_likes": {"$sum": "$likes_count"},
+                "rating_sum": {"$sum": {"$ifNull": ["$rating", 0]}},
+                "rating_count": {"$sum": {"$cond": [{"$eq": [{"$ifNull": ["$rating", None]}, None]}, 0, 1]}},
+                "cover_image": {"$first": "$cover_image"}
+            }
+        },
+        {"$set": {"popularity_score": GAME_SCORE, "rebuilt_at": rebuilt_at}},
+        {"$merge": {"into": "game_stats", "whenMatched": "replace", "whenNotMatched": "insert"}}
+    ]).to_list(None)
+    # Games whose reviews are all gone were not rewritten; games first seen by
+    # update_game_stats during the rebuild have no stamp and are kept
+    await db.game_stats.delete_many({"rebuilt_at": {"$lt": rebuilt_at}})
+
+async def game_stats_rebuild_loop():
+    while True:
+        try:
+            if await acquire_lease("game-stats-rebuild", 2 * GAME_STATS_REBUILD_SECONDS):
+                await rebuild_game_stats()
+            response_cache.invalidate_prefix("popular-games:")
+        except Exception as e:
+            logger.error(f"Game stats rebuild error: {str(e)}")
+        await asyncio.sleep(GAME_STATS_REBUILD_SECONDS)
+
+# Review deletion
+reaper_wakeup = asyncio.Event()
+
+async def retire_review(review: dict, session=None) -> bool:
+    # The tombstone is written before the review goes away, so a crash in
+    # between leaves a job the reaper can finish
+    await db.review_deletions.update_one(
+        {"_id": review['id']},
+        {"$setOnInsert": {
+            "review": {k: v for k, v in review.items() if k not in ("_id", "content")},
+            "status": "pending",
+            "comments_deleted": 0,
+            "likes_deleted": 0,
+            "created_at": datetime.now(timezone.utc),
+        }},
+        upsert=True,
+        session=session
+    )
+    # Whoever actually removes the document moves the counters, exactly once
+    result = await db.reviews.delete_one({"id": review['id']}, session=session)
+    if result.deleted_count:
+        await adjust_review_count(review['category'], -1, session=session)
+    return bool(result.deleted_count)
+
+async def finish_retirement(review: dict):
+    await update_game_stats(review['game_name'], game_stats_delta(review, -1))
+    unindex_review(review['id'])
+    invalidate_review_caches(review['id'], feeds=True, leaderboard=True, comments=True)
+    await invalidate_explanations(review['id'])
+
+async def reap_batch(collection, review_id: str) -> Optional[int]:
+    # None once no children are left; otherwise how many this batch removed
+    docs = await collection.find(
+        {"review_id": review_id}, {"_id": 1}
+    ).limit(REAPER_BATCH_SIZE).to_list(REAPER_BATCH_SIZE)
+    if not docs:
+        return None
+    result = await collection.delete_many({"_id": {"$in": [doc['_id'] for doc in docs]}})
+    return result.deleted_count
+
+async def reap_review(job: dict):
+    review_id = job['_id']
+    # Resuming a job whose request died before the review itself was removed
+    review = await db.reviews.find_one({"id": review_id}, {"_id": 0})
+    if review and await retire_review(review):
+        await finish_retirement(review)
+    
+    for collection_name, progress_field in (("comments", "comments_deleted"), ("likes", "likes_deleted")):
+        while True:
+            deleted = await reap_batch(db[collection_name], review_id)
+            if deleted is None:
+                break
+            if deleted:
+                await db.review_deletions.update_one({"_id": review_id}, {"$inc": {progress_field: deleted}})
+            await asyncio.sleep(REAPER_PAUSE_SECONDS)
+    
+    await db.review_deletions.update_one(
+        {"_id": review_id},
+        {"$set": {"status": "done", "finished_at": datetime.now(timezone.utc)}}
+    )
+
+async def job_loop(jobs, run_job, wakeup: asyncio.Event, label: str):
+    # Pending jobs, including those interrupted by a restart, are picked up on
+    # every pass unless deferred with run_after; request handlers set wakeup
+    # instead of waiting for the poll.
+    # A job that fails is recorded and skipped for the rest of the pass, so it
+    # cannot hold up the jobs queued behind it.
+    while True:
+        wakeup.clear()
+        failed = []
+        try:
+            while True:
+                query = {
+                    "status": "pending",
+                    "_id": {"$nin": failed},
+                    "run_after": {"$not": {"$gt": datetime.now(timezone.utc)}},
+                }
+                pending = await jobs.find(query).sort("created_at", ASCENDING).to_list(100)
+                if not pending:
+                    break
+                for job in pending:
+                    try:
+                        await run_job(job)
+                    except Exception as e:
+                        logger.error(f"{label} error on job {job['_id']}: {str(e)}")
+                        failed.append(job['_id'])
+                        await jobs.update_one(
+                            {"_id": job['_id']},
+                            {"$inc": {"attempts": 1}, "$set": {"last_error": str(e), "last_attempt_at": datetime.now(timezone.utc)}}
+                        )
+        except Exception as e:
+            logger.error(f"{label} error: {str(e)}")
+        try:
+            await asyncio.wait_for(wakeup.wait(), JOB_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+# Username propagation: reviews and comments carry a copy of author_username
+rename_wakeup = asyncio.Event()
+
+async def enqueue_rename(user_id: str, username: str):
+    # A newer rename replaces the target and restarts the scan from the beginning
+    await db.rename_jobs.update_one(
+        {"_id": user_id},
+        {
+            "$set": {
+                "username": username,
+                "status": "pending",
+                "checkpoints": {"reviews": None, "comments": None},
+                "reviews_updated": 0,
+                "comments_updated": 0,
+                "swept": False,
+                "created_at": datetime.now(timezone.utc),
+            },
+            "$unset": {"finished_at": "", "run_after": ""},
+        },
+        upsert=True
+    )
+    rename_wakeup.set()
+
+async def rename_batch(job: dict, collection_name: str) -> bool:
+    # Rewrites the next batch after the checkpoint; False once the collection is done
+    user_id, username = job['_id'], job['username']
+    query = {"author_id": user_id}
+    checkpoint = job['checkpoints'][collection_name]
+    if checkpoint is not None:
+        query['_id'] = {"$gt": checkpoint}
+    
+    projection = {**REVIEW_INDEX_FIELDS, "_id": 1} if collection_name == "reviews" else {"_id": 1, "review_id": 1, "author_username": 1}
+    docs = await db[collection_name].find(query, projection).sort("_id", ASCENDING).limit(RENAME_BATCH_SIZE).to_list(RENAME_BATCH_SIZE)
+    if not docs:
+        return False
+    
+    stale = [doc for doc in docs if doc.get('author_username') != username]
+    if stale:
+        update = {"$set": {"author_username": username}}
+        if collection_name == "reviews":
+            # Renames change what review readers see, so they move the ETag
+            update["$inc"] = {"version": 1}
+        await db[collection_name].bulk_write([UpdateOne({"_id": doc['_id']}, update) for doc in stale], ordered=False)
+    
+    for doc in stale:
+        if collection_name == "reviews":
+            index_review({k: v for k, v in doc.items() if k != '_id'} | {"author_username": username})
+            response_cache.invalidate(f"review:{doc['id']}")
+        else:
+            response_cache.invalidate_prefix(f"comments:{doc['review_id']}:")
+    if stale and collection_name == "reviews":
+        response_cache.invalidate_prefix("reviews:")
     
-    if isinstance(user_doc.get('created_at'), str):
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
+    # Guarded on the target name: a rename that arrived meanwhile has reset the job
+    result = await db.rename_jobs.update_one(
+        {"_id": user_id, "username": username},
+        {
+            "$set": {f"checkpoints.{collection_name}": docs[-1]['_id']},
+            "$inc": {f"{collection_name}_updated": len(stale)},
+        }
+    )
+    if not result.modified_count:
+        return False
+    job['checkpoints'][collection_name] = docs[-1]['_id']
+    return True
+
+async def propagate_rename(job: dict):
+    for collection_name in ("reviews", "comments"):
+        while await rename_batch(job, collection_name):
+            await asyncio.sleep(RENAME_PAUSE_SECONDS)
     
-    return User(**user_doc)
+    if not job.get('swept'):
+        # Documents written meanwhile under the old name are caught by a second
+        # pass once no worker can still be using it
+        await db.rename_jobs.update_one(
+            {"_id": job['_id'], "username": job['username']},
+            {"$set": {
+                "swept": True,
+                "checkpoints": {"reviews": None, "comments": None},
+                "run_after": datetime.now(timezone.utc) + timedelta(seconds=RENAME_SWEEP_DELAY),
+            }}
+        )
+        return
+    
+    # Left pending (and picked up again) if a newer rename superseded this one
+    await db.rename_jobs.update_one(
+        {"_id": job['_id'], "username": job['username']},
+        {"$set": {"status": "done", "finished_at": datetime.now(timezone.utc)}}
+    )
+
+def invalidate_review_caches(review_id: Optional[str] = None, feeds: bool = False, leaderboard: bool = False,
+                             comments: bool = False):
+    # Only what the write makes wrong is dropped. Feed pages and the leaderboard
+    # may show likes_count/comments_count up to their TTL behind, so likes and
+    # comments leave them alone.
+    if review_id:
+        response_cache.invalidate(f"review:{review_id}")
+        if comments:
+            response_cache.invalidate_prefix(f"comments:{review_id}:")
+    if feeds:
+        response_cache.invalidate_prefix("reviews:")
+    if leaderboard:
+        response_cache.invalidate_prefix("popular-games:")
 
 # Auth routes
 @api_router.post("/auth/register", response_model=Token)
@@ -180,13 +910,16 @@ async def register(user_data: UserCreate):
         raise HTTPException(status_code=400, detail="Email or username already registered")
     
     # Create user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     user = User(email=user_data.email, username=user_data.username)
     user_dict = user.model_dump()
     user_dict['password'] = hashed_password
-    user_dict['created_at'] = user_dict['created_at'].isoformat()
     
-    await db.users.insert_one(user_dict)
+    try:
+        await db.users.insert_one(user_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email or username already registered")
+    index_user(user_dict)
     
     # Create token
     access_token = create_access_token(data={"sub": user.id})
@@ -195,11 +928,14 @@ async def register(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=Token)
 async def login(user_data: UserLogin):
     user_doc = await db.users.find_one({"email": user_data.email})
-    if not user_doc or not verify_password(user_data.password, user_doc['password']):
+    if not user_doc:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
     
-    if isinstance(user_doc.get('created_at'), str):
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
+    valid, new_hash = await verify_password(user_data.password, user_doc['password'])
+    if not valid:
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+    if new_hash:
+        await db.users.update_one({"id": user_doc['id']}, {"$set": {"password": new_hash}})
     
     user = User(**{k: v for k, v in user_doc.items() if k != 'password'})
     access_token = create_access_token(data={"sub": user.id})
@@ -215,43 +951,67 @@ async def create_review(review_data: ReviewCreate, current_user: User = Depends(
     review = Review(
         **review_data.model_dump(),
         author_id=current_user.id,
-        author_username=current_user.username
+        author_username=current_user.username,
+        excerpt=make_excerpt(review_data.content)
     )
     review_dict = review.model_dump()
-    review_dict['created_at'] = review_dict['created_at'].isoformat()
-    review_dict['updated_at'] = review_dict['updated_at'].isoformat()
     
     await db.reviews.insert_one(review_dict)
+    await adjust_review_count(review.category, 1)
+    index_review(review_dict)
+    await update_game_stats(review.game_name, game_stats_delta(review_dict), review.cover_image)
+    invalidate_review_caches(feeds=True, leaderboard=True)
     return review
 
-@api_router.get("/reviews", response_model=List[Review])
-async def get_reviews(skip: int = 0, limit: int = 20, category: Optional[str] = None):
+@api_router.get("/reviews", response_model=Union[List[ReviewSummary], List[Review]])
+async def get_reviews(response: Response, skip: int = 0, limit: int = 20, category: Optional[str] = None, cursor: Optional[str] = None,
+                      fields: Literal["summary", "full"] = "summary"):
     query = {}
     if category:
         query['category'] = category
     
-    reviews = await db.reviews.find(query, {"_id": 0}).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
+    async def load_page():
+        reviews, next_cursor = await fetch_page(list_db.reviews, query, skip, limit, cursor, REVIEW_PROJECTIONS[fields])
+        return dump_json(reviews), next_cursor
     
-    for review in reviews:
-        if isinstance(review.get('created_at'), str):
-            review['created_at'] = datetime.fromisoformat(review['created_at'])
-        if isinstance(review.get('updated_at'), str):
-            review['updated_at'] = datetime.fromisoformat(review['updated_at'])
+    # Only first pages are hot enough to be worth caching; they are cached
+    # already serialized
+    if skip == 0 and not cursor:
+        body, next_cursor = await response_cache.get_or_load(
+            f"reviews:{category or ''}:{limit}:{fields}", CACHE_TTLS["reviews"], load_page
+        )
+    else:
+        body, next_cursor = await load_page()
     
-    return reviews
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return json_body(body, response)
 
-@api_router.get("/reviews/{review_id}", response_model=Review)
-async def get_review(review_id: str):
-    review = await db.reviews.find_one({"id": review_id}, {"_id": 0})
-    if not review:
-        raise HTTPException(status_code=404, detail="Review not found")
+@api_router.get("/reviews/count")
+async def get_review_count(category: Optional[str] = None):
+    if not category:
+        return {"count": await db.reviews.estimated_document_count()}
+    
+    counter = await db.review_counts.find_one({"_id": category})
+    return {"count": max(counter['count'], 0) if counter else 0}
+
+async def load_review(review_id: str) -> Review:
+    async def load():
+        review = await db.reviews.find_one({"id": review_id}, {"_id": 0})
+        if not review:
+            raise HTTPException(status_code=404, detail="Review not found")
+        
+        return Review(**review)
     
-    if isinstance(review.get('created_at'), str):
-        review['created_at'] = datetime.fromisoformat(review['created_at'])
-    if isinstance(review.get('updated_at'), str):
-        review['updated_at'] = datetime.fromisoformat(review['updated_at'])
+    return await response_cache.get_or_load(f"review:{review_id}", CACHE_TTLS["review"], load)
+
+@api_router.get("/reviews/{review_id}", response_model=Review)
+async def get_review(review_id: str, request: Request, response: Response):
+    review = await load_review(review_id)
     
-    return Review(**review)
+    etag = make_etag(review.id, review.updated_at.isoformat(), review.version)
+    not_modified = conditional_response(request, response, "review", etag)
+    return not_modified or review
 
 @api_router.put("/reviews/{review_id}", response_model=Review)
 async def update_review(review_id: str, review_data: ReviewUpdate, current_user: User = Depends(get_current_user)):
@@ -263,15 +1023,25 @@ async def update_review(review_id: str, review_data: ReviewUpdate, current_user:
         raise HTTPException(status_code=403, detail="Not authorized to edit this review")
     
     update_data = {k: v for k, v in review_data.model_dump().items() if v is not None}
-    update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+    update_data['updated_at'] = datetime.now(timezone.utc)
+    if 'content' in update_data:
+        update_data['excerpt'] = make_excerpt(update_data['content'])
     
-    await db.reviews.update_one({"id": review_id}, {"$set": update_data})
+    await db.reviews.update_one({"id": review_id}, {"$set": update_data, "$inc": {"version": 1}})
+    
+    if 'category' in update_data and update_data['category'] != review['category']:
+        await adjust_review_count(review['category'], -1)
+        await adjust_review_count(update_data['category'], 1)
     
     updated_review = await db.reviews.find_one({"id": review_id}, {"_id": 0})
-    if isinstance(updated_review.get('created_at'), str):
-        updated_review['created_at'] = datetime.fromisoformat(updated_review['created_at'])
-    if isinstance(updated_review.get('updated_at'), str):
-        updated_review['updated_at'] = datetime.fromisoformat(updated_review['updated_at'])
+    index_review(updated_review)
+    stats_changed = updated_review['game_name'] != review['game_name'] or updated_review.get('rating') != review.get('rating')
+    if stats_changed:
+        await update_game_stats(review['game_name'], game_stats_delta(review, -1))
+        await update_game_stats(updated_review['game_name'], game_stats_delta(updated_review), updated_review.get('cover_image'))
+    invalidate_review_caches(review_id, feeds=True, leaderboard=stats_changed)
+    if 'content' in update_data:
+        await invalidate_explanations(review_id)
     
     return Review(**updated_review)
 
@@ -284,9 +1054,15 @@ async def delete_review(review_id: str, current_user: User = Depends(get_current
     if review['author_id'] != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this review")
     
-    await db.reviews.delete_one({"id": review_id})
-    await db.comments.delete_many({"review_id": review_id})
-    await db.likes.delete_many({"review_id": review_id})
+    # Comments and likes are removed by the reaper; the response does not wait for them
+    if USE_TRANSACTIONS:
+        async with await client.start_session() as session:
+            deleted = await session.with_transaction(lambda s: retire_review(review, s))
+    else:
+        deleted = await retire_review(review)
+    if deleted:
+        await finish_retirement(review)
+    reaper_wakeup.set()
     
     return {"message": "Review deleted successfully"}
 
@@ -300,7 +1076,9 @@ async def add_collaborator(review_id: str, user_id: str, current_user: User = De
         raise HTTPException(status_code=403, detail="Only the author can add collaborators")
     
     if user_id not in review.get('collaborators', []):
-        await db.reviews.update_one({"id": review_id}, {"$push": {"collaborators": user_id}})
+        await db.reviews.update_one({"id": review_id}, {"$push": {"collaborators": user_id}, "$inc": {"version": 1}})
+        # Full feed pages carry the collaborator list
+        invalidate_review_caches(review_id, feeds=True)
     
     return {"message": "Collaborator added successfully"}
 
@@ -318,61 +1096,175 @@ async def create_comment(review_id: str, comment_data: CommentCreate, current_us
         content=comment_data.content
     )
     comment_dict = comment.model_dump()
-    comment_dict['created_at'] = comment_dict['created_at'].isoformat()
     
     await db.comments.insert_one(comment_dict)
-    await db.reviews.update_one({"id": review_id}, {"$inc": {"comments_count": 1}})
+    await db.reviews.update_one({"id": review_id}, {"$inc": {"comments_count": 1, "version": 1}})
+    invalidate_review_caches(review_id, comments=True)
     
     return comment
 
-@api_router.get("/reviews/{review_id}/comments", response_model=List[Comment])
-async def get_comments(review_id: str):
-    comments = await db.comments.find({"review_id": review_id}, {"_id": 0}).sort("created_at", -1).to_list(100)
+async def stream_comments(review_id: str, cursor: Optional[str] = None):
+    # One JSON document per line, written as the Motor cursor yields batches
+    query = {"review_id": review_id}
+    if cursor:
+        query = {"$and": [query, decode_cursor(cursor)]}
     
-    for comment in comments:
-        if isinstance(comment.get('created_at'), str):
-            comment['created_at'] = datetime.fromisoformat(comment['created_at'])
+    find = db.comments.find(query, {"_id": 0}).sort(FEED_SORT).batch_size(COMMENTS_PAGE_SIZE)
+    async for comment in find:
+        yield dump_json(comment) + b"\n"
+
+async def load_comments_page(review_id: str, limit: int, cursor: Optional[str] = None):
+    # Returns the serialized page with its next cursor and ETag
+    async def load():
+        comments, next_cursor = await fetch_page(db.comments, {"review_id": review_id}, 0, limit, cursor)
+        # Hashing the body moves the ETag on renames as well as new comments
+        body = dump_json(comments)
+        return body, next_cursor, make_etag(review_id, cursor or "", hashlib.sha1(body).hexdigest())
     
-    return comments
+    # Open threads hit the first page; it is cached until the next comment
+    if not cursor:
+        return await response_cache.get_or_load(f"comments:{review_id}:{limit}", CACHE_TTLS["comments"], load)
+    return await load()
+
+@api_router.get("/reviews/{review_id}/comments", response_model=List[Comment])
+async def get_comments(review_id: str, request: Request, response: Response,
+                       limit: int = Query(COMMENTS_PAGE_SIZE, ge=1, le=COMMENTS_MAX_PAGE_SIZE),
+                       cursor: Optional[str] = None, format: Literal["json", "ndjson"] = "json"):
+    if format == "ndjson":
+        # Streams the rest of the thread after cursor; limit only applies to JSON pages
+        if cursor:
+            decode_cursor(cursor)
+        return StreamingResponse(stream_comments(review_id, cursor), media_type="application/x-ndjson")
+    
+    body, next_cursor, etag = await load_comments_page(review_id, limit, cursor)
+    not_modified = conditional_response(request, response, "comments", etag)
+    if not_modified:
+        return not_modified
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return json_body(body, response)
 
 # Like routes
-@api_router.post("/reviews/{review_id}/like")
-async def toggle_like(review_id: str, current_user: User = Depends(get_current_user)):
-    review = await db.reviews.find_one({"id": review_id})
+async def apply_like_toggle(review_id: str, user_id: str, session=None):
+    # The unique (review_id, user_id) key makes the upsert the source of truth:
+    # the counter only moves when a like document was actually created or removed
+    like = Like(review_id=review_id, user_id=user_id)
+    like_dict = like.model_dump()
+    like_key = {"review_id": review_id, "user_id": user_id}
+    
+    try:
+        result = await db.likes.update_one(like_key, {"$setOnInsert": like_dict}, upsert=True, session=session)
+        liked = result.upserted_id is not None
+    except DuplicateKeyError:
+        # Lost an upsert race against a concurrent click; the like exists
+        liked = False
+    
+    if not liked:
+        result = await db.likes.delete_one(like_key, session=session)
+        if not result.deleted_count:
+            # A concurrent toggle already removed it; nothing changed
+            review = await db.reviews.find_one({"id": review_id}, {"_id": 0, "game_name": 1}, session=session)
+            if not review:
+                raise HTTPException(status_code=404, detail="Review not found")
+            return False, None
+    
+    review = await db.reviews.find_one_and_update(
+        {"id": review_id},
+        {"$inc": {"likes_count": 1 if liked else -1, "version": 1}},
+        projection={"_id": 0, "game_name": 1},
+        return_document=ReturnDocument.AFTER,
+        session=session
+    )
     if not review:
+        if liked:
+            await db.likes.delete_one(like_key, session=session)
         raise HTTPException(status_code=404, detail="Review not found")
+    return liked, review
+
+@api_router.post("/reviews/{review_id}/like")
+async def toggle_like(review_id: str, current_user: User = Depends(get_current_user)):
+    if USE_TRANSACTIONS:
+        async with await client.start_session() as session:
+            liked, review = await session.with_transaction(
+                lambda s: apply_like_toggle(review_id, current_user.id, s)
+            )
+    else:
+        liked, review = await apply_like_toggle(review_id, current_user.id)
     
-    existing_like = await db.likes.find_one({"review_id": review_id, "user_id": current_user.id})
+    if review:
+        await update_game_stats(review['game_name'], {"total_likes": 1 if liked else -1})
+        invalidate_review_caches(review_id)
     
-    if existing_like:
-        await db.likes.delete_one({"id": existing_like['id']})
-        await db.reviews.update_one({"id": review_id}, {"$inc": {"likes_count": -1}})
-        return {"liked": False, "message": "Like removed"}
-    else:
-        like = Like(review_id=review_id, user_id=current_user.id)
-        like_dict = like.model_dump()
-        like_dict['created_at'] = like_dict['created_at'].isoformat()
-        
-        await db.likes.insert_one(like_dict)
-        await db.reviews.update_one({"id": review_id}, {"$inc": {"likes_count": 1}})
+    if liked:
         return {"liked": True, "message": "Review liked"}
+    return {"liked": False, "message": "Like removed"}
 
 @api_router.get("/reviews/{review_id}/liked")
 async def check_liked(review_id: str, current_user: User = Depends(get_current_user)):
     like = await db.likes.find_one({"review_id": review_id, "user_id": current_user.id})
     return {"liked": like is not None}
 
+REVIEW_PAGE_PARTS = {"review", "comments", "liked"}
+
+@api_router.get("/reviews/{review_id}/page")
+async def get_review_page(review_id: str, include: str = "review,comments,liked",
+                          limit: int = Query(COMMENTS_PAGE_SIZE, ge=1, le=COMMENTS_MAX_PAGE_SIZE),
+                          current_user: Optional[User] = Depends(get_optional_user)):
+    # Everything the review page needs in one round trip; the lookups run concurrently
+    parts = {part.strip() for part in include.split(",") if part.strip()}
+    if not parts or parts - REVIEW_PAGE_PARTS:
+        raise HTTPException(status_code=400, detail=f"include must be a subset of {','.join(sorted(REVIEW_PAGE_PARTS))}")
+    
+    async def load_liked():
+        if current_user is None:
+            return None
+        like = await db.likes.find_one({"review_id": review_id, "user_id": current_user.id}, {"_id": 1})
+        return like is not None
+    
+    # The review is loaded even when excluded: it is cached and doubles as the 404 check
+    review, comments_page, liked = await asyncio.gather(
+        load_review(review_id),
+        load_comments_page(review_id, limit) if "comments" in parts else asyncio.sleep(0),
+        load_liked() if "liked" in parts else asyncio.sleep(0),
+    )
+    
+    page = {}
+    if "review" in parts:
+        page['review'] = review.model_dump()
+    if "comments" in parts:
+        body, next_cursor, _ = comments_page
+        # The cached comments page is already serialized; embed it verbatim
+        page['comments'] = orjson.Fragment(body)
+        page['next_cursor'] = next_cursor
+    if "liked" in parts:
+        page['liked'] = liked
+    return Response(content=dump_json(page), media_type="application/json")
+
+@api_router.post("/likes/status")
+async def get_like_status(request: LikeStatusRequest, current_user: User = Depends(get_current_user)):
+    # One indexed $in lookup for a whole feed page instead of a request per card
+    review_ids = list(dict.fromkeys(request.review_ids))
+    if not review_ids:
+        return {"liked": []}
+    
+    likes = await db.likes.find(
+        {"user_id": current_user.id, "review_id": {"$in": review_ids}},
+        {"_id": 0, "review_id": 1}
+    ).to_list(len(review_ids))
+    liked = {like['review_id'] for like in likes}
+    return {"liked": [review_id for review_id in review_ids if review_id in liked]}
+
 # User profile routes
 @api_router.get("/users/{user_id}", response_model=User)
-async def get_user_profile(user_id: str):
+async def get_user_profile(user_id: str, request: Request, response: Response):
     user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    if isinstance(user.get('created_at'), str):
-        user['created_at'] = datetime.fromisoformat(user['created_at'])
-    
-    return User(**user)
+    user = User(**user)
+    # Profiles carry no update timestamp; they are small enough to hash whole
+    not_modified = conditional_response(request, response, "user", make_etag(user.model_dump_json()))
+    return not_modified or user
 
 @api_router.put("/users/me", response_model=User)
 async def update_profile(user_data: UserUpdate, current_user: User = Depends(get_current_user)):
@@ -387,34 +1279,34 @@ async def update_profile(user_data: UserUpdate, current_user: User = Depends(get
         if existing:
             raise HTTPException(status_code=400, detail="Username already taken")
     
-    await db.users.update_one({"id": current_user.id}, {"$set": update_dict})
+    try:
+        await db.users.update_one({"id": current_user.id}, {"$set": update_dict})
+    except DuplicateKeyError:
+        # Lost a race against a concurrent rename to the same name
+        raise HTTPException(status_code=400, detail="Username already taken")
+    principal_cache.invalidate(current_user.id)
+    if update_dict.get('username', current_user.username) != current_user.username:
+        # Existing reviews and comments are rewritten in the background
+        await enqueue_rename(current_user.id, update_dict['username'])
     
     updated_user = await db.users.find_one({"id": current_user.id}, {"_id": 0, "password": 0})
-    if isinstance(updated_user.get('created_at'), str):
-        updated_user['created_at'] = datetime.fromisoformat(updated_user['created_at'])
+    index_user(updated_user)
     
     return User(**updated_user)
 
-@api_router.get("/users/{user_id}/reviews", response_model=List[Review])
-async def get_user_reviews(user_id: str, skip: int = 0, limit: int = 20):
-    reviews = await db.reviews.find({"author_id": user_id}, {"_id": 0}).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
+@api_router.get("/users/{user_id}/reviews", response_model=Union[List[ReviewSummary], List[Review]])
+async def get_user_reviews(user_id: str, request: Request, response: Response, skip: int = 0, limit: int = 20, cursor: Optional[str] = None,
+                           fields: Literal["summary", "full"] = "summary"):
+    reviews, next_cursor = await fetch_page(db.reviews, {"author_id": user_id}, skip, limit, cursor, REVIEW_PROJECTIONS[fields])
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
     
-    for review in reviews:
-        if isinstance(review.get('created_at'), str):
-            review['created_at'] = datetime.fromisoformat(review['created_at'])
-        if isinstance(review.get('updated_at'), str):
-            review['updated_at'] = datetime.fromisoformat(review['updated_at'])
-    
-    return reviews
+    etag = make_etag(fields, next_cursor, *[f"{review['id']}:{review['updated_at']}:{review.get('version', 0)}" for review in reviews])
+    not_modified = conditional_response(request, response, "user-reviews", etag)
+    return not_modified or json_body(dump_json(reviews), response)
 
 # AI routes
-@api_router.post("/ai/assist", response_model=AIAssistResponse)
-async def ai_assist(request: AIAssistRequest, current_user: User = Depends(get_current_user)):
-    try:
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=f"assist-{current_user.id}-{datetime.now(timezone.utc).timestamp()}",
-            system_message="""Sen oyun incelemeleri ve yaratıcı yazım konusunda uzman bir asistansın. 
+ASSIST_SYSTEM_MESSAGE = """Sen oyun incelemeleri ve yaratıcı yazım konusunda uzman bir asistansın. 
             
 KURALLAR:
 - SADECE oyun incelemeleri, oyun analizleri ve yaratıcı yazım hakkında yardım et
@@ -425,27 +1317,8 @@ KURALLAR:
 - Kısa ve öz önerilerde bulun (max 3-4 cümle)
 
 Sadece oyun incelemeleri yazımına yardımcı ol."""
-        ).with_model("openai", "gpt-5.2")
-        
-        prompt_text = request.prompt
-        if request.context:
-            prompt_text = f"Mevcut metin: {request.context}\n\nİstek: {request.prompt}"
-        
-        message = UserMessage(text=prompt_text)
-        response = await chat.send_message(message)
-        
-        return AIAssistResponse(suggestion=response)
-    except Exception as e:
-        logger.error(f"AI assist error: {str(e)}")
-        raise HTTPException(status_code=500, detail="AI assistance failed")
 
-@api_router.post("/ai/explain", response_model=WordExplainResponse)
-async def explain_word(request: WordExplainRequest):
-    try:
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=f"explain-{datetime.now(timezone.utc).timestamp()}",
-            system_message="""Sen oyun terimleri ve kelimeler konusunda uzman bir asistansın.
+EXPLAIN_SYSTEM_MESSAGE = """Sen oyun terimleri ve kelimeler konusunda uzman bir asistansın.
 
 KURALLAR:
 - SADECE oyun terimleri, oyunlarla ilgili kavramlar ve cümle bağlamındaki kelimeleri açıkla
@@ -456,17 +1329,187 @@ KURALLAR:
 - Maksimum 2-3 cümle kullan
 
 Sadece oyunlarla ilgili terimleri açıkla."""
-        ).with_model("openai", "gpt-5.2")
+
+def create_chat(session_id: str, system_message: str):
+    return new_chat(session_id, system_message, EMERGENT_LLM_KEY, LLM_PROVIDER, LLM_MODEL, stub=LLM_STUB)
+
+def assist_message(request: AIAssistRequest) -> UserMessage:
+    prompt_text = request.prompt
+    if request.context:
+        context = relevant_section(request.context, request.prompt, ASSIST_CONTEXT_TOKENS)
+        prompt_text = f"Mevcut metin: {context}\n\nİstek: {request.prompt}"
+    return UserMessage(text=prompt_text)
+
+def explain_message(word: str, context: str) -> UserMessage:
+    prompt = f"Kelime/Terim: '{word}'\n\nCümle bağlamı: {context}\n\nBu kelime/terimi açıkla:"
+    return UserMessage(text=prompt)
+
+def client_key(request: Request) -> str:
+    # Everything left of the hops our proxies added is client-supplied
+    if TRUSTED_PROXY_HOPS:
+        hops = [hop.strip() for hop in request.headers.get('x-forwarded-for', '').split(',') if hop.strip()]
+        if len(hops) >= TRUSTED_PROXY_HOPS:
+            return f"ip:{hops[-TRUSTED_PROXY_HOPS]}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def stream_events(request: Request, chunks, label: str, on_complete=None):
+    # Emits token events as the model produces them, then a done event carrying
+    # time-to-first-token and total latency. Stops pulling from the model as
+    # soon as the client goes away so abandoned generations do not burn quota.
+    started = time.perf_counter()
+    first_token = None
+    parts = []
+    try:
+        async for chunk in chunks:
+            if await request.is_disconnected():
+                logger.info(f"{label} stream cancelled by client after {len(parts)} chunks")
+                return
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            parts.append(chunk)
+            yield sse_event("token", {"text": chunk})
         
-        prompt = f"Kelime/Terim: '{request.word}'\n\nCümle bağlamı: {request.context}\n\nBu kelime/terimi açıkla:"
-        message = UserMessage(text=prompt)
-        response = await chat.send_message(message)
+        total = time.perf_counter() - started
+        if on_complete:
+            await on_complete("".join(parts))
+        logger.info(f"{label} stream ttfb={first_token or total:.3f}s total={total:.3f}s")
+        yield sse_event("done", {
+            "ttfb_ms": round((first_token or total) * 1000, 1),
+            "total_ms": round(total * 1000, 1)
+        })
+    except Exception as e:
+        logger.error(f"{label} stream error: {str(e)}")
+        yield sse_event("error", {"detail": f"{label} failed"})
+    finally:
+        await chunks.aclose()
+
+def sse_response(events, ticket=None) -> StreamingResponse:
+    # Releasing the gateway ticket again after the response covers streams
+    # that were cancelled before their first chunk was pulled
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(ticket.release) if ticket else None
+    )
+
+@api_router.post("/ai/assist", response_model=AIAssistResponse)
+async def ai_assist(request: AIAssistRequest, current_user: User = Depends(get_current_user)):
+    try:
+        chat = create_chat(f"assist-{current_user.id}-{datetime.now(timezone.utc).timestamp()}", ASSIST_SYSTEM_MESSAGE)
+        response = await ai_gateway.call(
+            f"user:{current_user.id}", lambda: chat.send_message(assist_message(request)), label="ai_assist"
+        )
+        
+        return AIAssistResponse(suggestion=response)
+    except GatewayRejected:
+        raise
+    except Exception as e:
+        logger.error(f"AI assist error: {str(e)}")
+        raise HTTPException(status_code=500, detail="AI assistance failed")
+
+@api_router.post("/ai/assist/stream")
+async def ai_assist_stream(request: AIAssistRequest, http_request: Request, current_user: User = Depends(get_current_user)):
+    # The chat is built before admission so a construction error cannot strand a slot
+    chat = create_chat(f"assist-{current_user.id}-{datetime.now(timezone.utc).timestamp()}", ASSIST_SYSTEM_MESSAGE)
+    ticket = await ai_gateway.admit(f"user:{current_user.id}", label="ai_assist_stream")
+    chunks = ai_gateway.stream(ticket, stream_reply(chat, assist_message(request)))
+    return sse_response(stream_events(http_request, chunks, "AI assist"), ticket)
+
+async def generate_explanation(word: str, context: str, client: str) -> str:
+    chat = create_chat(f"explain-{datetime.now(timezone.utc).timestamp()}", EXPLAIN_SYSTEM_MESSAGE)
+    return await ai_gateway.call(client, lambda: chat.send_message(explain_message(word, context)), label="explain_word")
+
+def explanation_key(word: str, context: str) -> str:
+    # Hashing the context along with the word means a client cannot poison the
+    # entry another review's readers hit, and an edited review gets fresh keys
+    normalized = " ".join(fold(word).split())
+    return hashlib.sha1(f"{normalized}\x00{context}".encode()).hexdigest()
+
+async def store_explanation(key: str, word: str, review_id: Optional[str], explanation: str):
+    await db.explanations.update_one(
+        {"_id": key},
+        {"$set": {
+            "word": word,
+            "review_id": review_id,
+            "explanation": explanation,
+            "created_at": datetime.now(timezone.utc)
+        }},
+        upsert=True
+    )
+
+async def get_explanation(word: str, context: str, client: str, review_id: Optional[str] = None) -> str:
+    key = explanation_key(word, context)
+    
+    async def load_explanation():
+        cached = await db.explanations.find_one({"_id": key})
+        if cached:
+            return cached['explanation']
         
-        return WordExplainResponse(explanation=response)
+        # Only the request that actually reaches the model spends the client's budget
+        explanation = await generate_explanation(word, context, client)
+        await store_explanation(key, word, review_id, explanation)
+        return explanation
+    
+    return await explain_cache.get_or_load(key, EXPLAIN_CACHE_TTL, load_explanation)
+
+async def resolve_explain_context(request: WordExplainRequest) -> str:
+    # Only the sentences around the selected word are sent upstream
+    text = request.context
+    if text is None:
+        if not request.review_id:
+            raise HTTPException(status_code=400, detail="Either context or review_id is required")
+        text = (await load_review(request.review_id)).content
+    
+    # The offset tells repeated words apart; one that does not point at the
+    # word (e.g. the review was edited since) falls back to the first match
+    offset = request.offset
+    word = request.word.strip()
+    if offset is None or fold(text[offset:offset + len(word)]) != fold(word):
+        offset = find_term(text, request.word)
+    return window_around(text, offset, EXPLAIN_CONTEXT_TOKENS)
+
+async def invalidate_explanations(review_id: str):
+    await db.explanations.delete_many({"review_id": review_id})
+
+@api_router.post("/ai/explain", response_model=WordExplainResponse)
+async def explain_word(request: WordExplainRequest, http_request: Request):
+    context = await resolve_explain_context(request)
+    try:
+        explanation = await get_explanation(request.word, context, client_key(http_request), request.review_id)
+        return WordExplainResponse(explanation=explanation)
+    except GatewayRejected:
+        raise
     except Exception as e:
         logger.error(f"Word explain error: {str(e)}")
         raise HTTPException(status_code=500, detail="Word explanation failed")
 
+@api_router.post("/ai/explain/stream")
+async def explain_word_stream(request: WordExplainRequest, http_request: Request):
+    context = await resolve_explain_context(request)
+    key = explanation_key(request.word, context)
+    
+    cached = explain_cache.get(key)
+    if cached is None:
+        stored = await db.explanations.find_one({"_id": key})
+        cached = stored['explanation'] if stored else None
+    if cached is not None:
+        async def replay():
+            yield cached
+        return sse_response(stream_events(http_request, replay(), "Word explain"))
+    
+    async def remember(explanation: str):
+        await store_explanation(key, request.word, request.review_id, explanation)
+        explain_cache.set(key, explanation, EXPLAIN_CACHE_TTL)
+    
+    chat = create_chat(f"explain-{datetime.now(timezone.utc).timestamp()}", EXPLAIN_SYSTEM_MESSAGE)
+    ticket = await ai_gateway.admit(client_key(http_request), label="explain_word_stream")
+    chunks = ai_gateway.stream(ticket, stream_reply(chat, explain_message(request.word, context)))
+    return sse_response(stream_events(http_request, chunks, "Word explain", on_complete=remember), ticket)
+
 # Categories
 @api_router.get("/categories")
 async def get_categories():
@@ -499,73 +1542,50 @@ async def get_categories():
     }
 
 # Search
+def encode_search_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode()).decode()
+
+def decode_search_cursor(cursor: str) -> int:
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["offset"])
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def fetch_ranked(collection, ranked_ids: List[str], projection: dict) -> List[dict]:
+    if not ranked_ids:
+        return []
+    docs = await collection.find({"id": {"$in": ranked_ids}}, projection).to_list(len(ranked_ids))
+    by_id = {doc['id']: doc for doc in docs}
+    return [by_id[doc_id] for doc_id in ranked_ids if doc_id in by_id]
+
 @api_router.get("/search")
-async def search(q: str, skip: int = 0, limit: int = 20):
+async def search(q: str, response: Response, skip: int = 0, limit: int = 20, cursor: Optional[str] = None,
+                 fields: Literal["summary", "full"] = "summary"):
     if not q or len(q.strip()) < 2:
-        return {"reviews": [], "users": []}
+        return {"reviews": [], "users": [], "next_cursor": None}
     
-    query_lower = q.lower().strip()
-    
-    # Search reviews by title or game name
-    reviews = await db.reviews.find(
-        {
-            "$or": [
-                {"title": {"$regex": query_lower, "$options": "i"}},
-                {"game_name": {"$regex": query_lower, "$options": "i"}},
-                {"author_username": {"$regex": query_lower, "$options": "i"}}
-            ]
-        },
-        {"_id": 0}
-    ).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-    
-    for review in reviews:
-        if isinstance(review.get('created_at'), str):
-            review['created_at'] = datetime.fromisoformat(review['created_at'])
-        if isinstance(review.get('updated_at'), str):
-            review['updated_at'] = datetime.fromisoformat(review['updated_at'])
+    # Rank reviews by title, game name and author, most relevant first
+    offset = decode_search_cursor(cursor) if cursor else skip
+    ranked = review_index.search(q)
+    page_ids = [doc_id for doc_id, _ in ranked[offset:offset + limit]]
+    reviews = await fetch_ranked(list_db.reviews, page_ids, REVIEW_PROJECTIONS[fields])
+    next_cursor = encode_search_cursor(offset + limit) if offset + limit < len(ranked) else None
     
     # Search users by username
-    users = await db.users.find(
-        {"username": {"$regex": query_lower, "$options": "i"}},
-        {"_id": 0, "password": 0}
-    ).limit(10).to_list(10)
+    user_ids = [doc_id for doc_id, _ in user_index.search(q)[:10]]
+    users = await fetch_ranked(list_db.users, user_ids, {"_id": 0, "password": 0})
     
-    for user in users:
-        if isinstance(user.get('created_at'), str):
-            user['created_at'] = datetime.fromisoformat(user['created_at'])
-    
-    return {"reviews": reviews, "users": users}
+    return json_body(dump_json({"reviews": reviews, "users": users, "next_cursor": next_cursor}), response)
 
 # Popular games
 @api_router.get("/popular-games")
 async def get_popular_games(limit: int = 3):
-    # Aggregate reviews by game_name and calculate popularity score
-    pipeline = [
-        {
-            "$group": {
-                "_id": "$game_name",
-                "review_count": {"$sum": 1},
-                "total_likes": {"$sum": "$likes_count"},
-                "avg_rating": {"$avg": "$rating"},
-                "cover_image": {"$first": "$cover_image"}
-            }
-        },
-        {
-            "$addFields": {
-                "popularity_score": {
-                    "$add": [
-                        {"$multiply": ["$review_count", 10]},
-                        {"$multiply": ["$total_likes", 5]},
-                        {"$multiply": [{"$ifNull": ["$avg_rating", 0]}, 2]}
-                    ]
-                }
-            }
-        },
-        {"$sort": {"popularity_score": -1}},
-        {"$limit": limit}
-    ]
-    
-    popular_games = await db.reviews.aggregate(pipeline).to_list(limit)
+    # Read the top of the materialized leaderboard kept in game_stats
+    popular_games = await response_cache.get_or_load(
+        f"popular-games:{limit}",
+        CACHE_TTLS["popular-games"],
+        lambda: list_db.game_stats.find({}).sort("popularity_score", -1).limit(limit).to_list(limit)
+    )
     
     return {
         "popular_games": [
@@ -573,7 +1593,7 @@ async def get_popular_games(limit: int = 3):
                 "game_name": game["_id"],
                 "review_count": game["review_count"],
                 "total_likes": game["total_likes"],
-                "avg_rating": round(game.get("avg_rating", 0), 1) if game.get("avg_rating") else None,
+                "avg_rating": round(game["rating_sum"] / game["rating_count"], 1) if game.get("rating_count") else None,
                 "cover_image": game.get("cover_image"),
                 "popularity_score": round(game["popularity_score"], 1)
             }
@@ -581,23 +1601,164 @@ async def get_popular_games(limit: int = 3):
         ]
     }
 
+# Admin
+@api_router.get("/admin/index-stats")
+async def get_index_stats(admin_user: User = Depends(get_admin_user)):
+    stats = {}
+    for collection_name in INDEXES:
+        usage = await db[collection_name].aggregate([{"$indexStats": {}}]).to_list(None)
+        stats[collection_name] = [
+            {
+                "name": index["name"],
+                "key": dict(index["key"]),
+                "ops": index["accesses"]["ops"],
+                "since": index["accesses"]["since"],
+            }
+            for index in usage
+        ]
+    return {"indexes": stats}
+
+@api_router.get("/admin/db-stats")
+async def get_db_stats(admin_user: User = Depends(get_admin_user)):
+    # Shows which topology the client discovered and where list reads are routed
+    topology = client.topology_description
+    pool = client.options.pool_options
+    return {
+        "topology": topology.topology_type_name,
+        "servers": [
+            {"address": f"{host}:{port}", "type": server.server_type_name,
+             "round_trip_ms": round(server.round_trip_time * 1000, 1) if server.round_trip_time is not None else None}
+            for (host, port), server in topology.server_descriptions().items()
+        ],
+        "pool": {
+            "max_pool_size": pool.max_pool_size,
+            "min_pool_size": pool.min_pool_size,
+            "max_idle_time_seconds": pool.max_idle_time_seconds,
+            "wait_queue_timeout": pool.wait_queue_timeout,
+            "connect_timeout": pool.connect_timeout,
+            "socket_timeout": pool.socket_timeout,
+        },
+        "server_selection_timeout": client.options.server_selection_timeout,
+        "compressors": mongo_options.get('compressors', []),
+        "list_read_preference": list_db.read_preference.document,
+    }
+
+@api_router.get("/admin/cache-stats")
+async def get_cache_stats(admin_user: User = Depends(get_admin_user)):
+    return {"responses": response_cache.stats(), "principals": principal_cache.stats()}
+
+@api_router.get("/admin/review-deletions")
+async def get_review_deletions(admin_user: User = Depends(get_admin_user)):
+    jobs = await db.review_deletions.find({}).sort("created_at", DESCENDING).to_list(50)
+    return {
+        "pending": await db.review_deletions.count_documents({"status": "pending"}),
+        "jobs": [
+            {
+                "review_id": job['_id'],
+                "title": job['review'].get('title'),
+                "status": job['status'],
+                "comments_deleted": job['comments_deleted'],
+                "comments_total": job['review'].get('comments_count', 0),
+                "likes_deleted": job['likes_deleted'],
+                "likes_total": job['review'].get('likes_count', 0),
+                "attempts": job.get('attempts', 0),
+                "last_error": job.get('last_error'),
+                "created_at": job['created_at'],
+                "finished_at": job.get('finished_at'),
+            }
+            for job in jobs
+        ],
+    }
+
+@api_router.get("/admin/rename-jobs")
+async def get_rename_jobs(admin_user: User = Depends(get_admin_user)):
+    jobs = await db.rename_jobs.find({}).sort("created_at", DESCENDING).to_list(50)
+    return {
+        "pending": await db.rename_jobs.count_documents({"status": "pending"}),
+        "jobs": [
+            {
+                "user_id": job['_id'],
+                "username": job['username'],
+                "status": job['status'],
+                "reviews_updated": job['reviews_updated'],
+                "comments_updated": job['comments_updated'],
+                "swept": job.get('swept', False),
+                "run_after": job.get('run_after'),
+                "attempts": job.get('attempts', 0),
+                "last_error": job.get('last_error'),
+                "created_at": job['created_at'],
+                "finished_at": job.get('finished_at'),
+            }
+            for job in jobs
+        ],
+    }
+
+@api_router.get("/admin/ai-stats")
+async def get_ai_stats(admin_user: User = Depends(get_admin_user)):
+    return ai_gateway.stats()
+
 # Include router
 app.include_router(api_router)
 
+# Prometheus scrape endpoint, served outside the /api prefix
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.exception_handler(GatewayRejected)
+async def gateway_rejected_handler(request: Request, exc: GatewayRejected):
+    headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=headers)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
+)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)),
+    gzip_level=int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6)),
+    brotli_quality=int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4)),
 )
 
+# Outermost, so request latency includes CORS and compression
+app.add_middleware(MetricsMiddleware)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+background_tasks = []
+
+@app.on_event("startup")
+async def startup_db_client():
+    await run_migration("timestamps", migrate_timestamps)
+    await run_migration("excerpts", backfill_excerpts)
+    await ensure_indexes()
+    await seed_review_counts()
+    await build_search_indexes()
+    background_tasks.append(asyncio.create_task(game_stats_rebuild_loop()))
+    if SEARCH_INDEX_REFRESH_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(search_index_refresh_loop()))
+    background_tasks.append(asyncio.create_task(event_loop_lag_probe(EVENT_LOOP_PROBE_INTERVAL)))
+    background_tasks.append(asyncio.create_task(
+        job_loop(db.review_deletions, reap_review, reaper_wakeup, "Review reaper")
+    ))
+    background_tasks.append(asyncio.create_task(
+        job_loop(db.rename_jobs, propagate_rename, rename_wakeup, "Rename propagation")
+    ))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in background_tasks:
+        task.cancel()
+    password_executor.shutdown(wait=False)
     client.close()
\ No newline at end of file
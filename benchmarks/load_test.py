@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+Load test for the Oyun Yazarlari API
+
+Boots backend/server.py under uvicorn against a local mongod (a throwaway
+database per run) with the stubbed LLM (LLM_STUB=true), seeds users,
+reviews and comments through the API, then drives workloads with an async
+client at a fixed concurrency and reports RPS and p50/p95/p99 per endpoint.
+
+Scenarios:
+  mixed        feed browsing, review open, search typeahead, likes, comments,
+               popular games, logins and word explanations in one weighted mix
+  login-burst  feed latency alone, then with a concurrent burst of logins
+  like-stress  concurrent like toggles on a few hot reviews, then verifies
+               likes_count against the likes collection and game_stats
+  payload      /api/reviews size and latency for fields=summary|full under
+               identity, gzip and br encodings
+
+Results are saved as JSON under benchmarks/results/ (or --output); pass
+--compare with an earlier file to print deltas and fail on regressions.
+
+    python benchmarks/load_test.py --scenario all --concurrency 32 --duration 20
+    python benchmarks/load_test.py --scenario mixed --compare benchmarks/results/load-<stamp>.json
+    python benchmarks/load_test.py --base-url http://localhost:8001 --db-name oyunyaz_bench_local --scenario payload
+
+--base-url seeds its users, reviews and comments into the running server's
+database and leaves them there, so that server must use a database whose
+name starts with oyunyaz_bench_.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from report import ROOT_DIR, compare_results, print_endpoint_table, run_metadata, save_results, summarize
+
+BACKEND_DIR = ROOT_DIR / "backend"
+# Every database this tool writes to carries this prefix
+BENCH_DB_PREFIX = "oyunyaz_bench_"
+
+GAMES = [
+    ("Elden Ring", "RPG"), ("Baldur's Gate 3", "RPG"), ("The Witcher 3", "RPG"),
+    ("Counter-Strike 2", "FPS"), ("Valorant", "FPS"), ("League of Legends", "MOBA"),
+    ("Dota 2", "MOBA"), ("Hollow Knight", "Metroidvania"), ("Hades", "Rogue-like"),
+    ("Minecraft", "Sandbox"), ("Resident Evil 4", "Korku"), ("Civilization VI", "Strateji"),
+    ("Forza Horizon 5", "Yarış"), ("Stardew Valley", "Simülasyon"), ("Celeste", "Platform"),
+    ("Red Dead Redemption 2", "Aksiyon"), ("Tekken 8", "Fighting"), ("Fortnite", "Battle Royale"),
+]
+WORDS = (
+    "oyun hikaye karakter dünya grafik müzik oynanış zorluk görev savaş harita keşif "
+    "atmosfer senaryo bölüm boss silah yetenek seviye hikâye anlatım tasarım deneyim "
+    "macera strateji takım rekabet denge performans kontrol ekip sezon güncelleme"
+).split()
+
+# Relative weights of the actions in the mixed scenario
+MIXED_WEIGHTS = {
+    "feed": 35,
+    "open": 25,
+    "search": 15,
+    "like": 10,
+    "comment": 5,
+    "popular": 5,
+    "login": 3,
+    "explain": 2,
+}
+
+
+def paragraphs(rng: random.Random, count: int) -> str:
+    return "\n\n".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))).capitalize() + "."
+        for _ in range(count)
+    )
+
+
+class Recorder:
+    """Collects per-endpoint latencies and statuses for one scenario phase"""
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def add(self, label: str, seconds: float, status):
+        label = f"{self.prefix}{label}"
+        self.latencies[label].append(seconds)
+        self.statuses[label][str(status)] += 1
+        if status == "error" or (isinstance(status, int) and status >= 500):
+            self.errors[label] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict]:
+        return {
+            label: summarize(self.latencies[label], elapsed, self.errors[label], self.statuses[label])
+            for label in sorted(self.latencies)
+        }
+
+
+class ServerProcess:
+    """Runs backend/server.py under uvicorn for the duration of the benchmark"""
+
+    def __init__(self, port: int, env: Dict[str, str]):
+        self.port = port
+        self.env = env
+        self.process = None
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def __aenter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1",
+             "--port", str(self.port), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env={**os.environ, **self.env},
+        )
+        await wait_until_ready(self.base_url, self.process)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+async def wait_until_ready(base_url: str, process: Optional[subprocess.Popen] = None, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=2) as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode} during startup")
+            try:
+                if (await client.get("/api/categories")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"Server at {base_url} did not become ready within {timeout}s")
+
+
+async def bounded_gather(coroutines, limit: int):
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(c) for c in coroutines))
+
+
+class LoadTest:
+    def __init__(self, args, base_url: str, db):
+        self.args = args
+        self.base_url = base_url
+        self.db = db
+        self.run_id = f"{int(time.time()) % 100000:05d}"
+        self.client: Optional[httpx.AsyncClient] = None
+        self.users: List[Dict] = []
+        self.review_ids: List[str] = []
+        self.review_cum_weights: List[float] = []
+        self.actions: Dict[str, Callable] = {
+            "feed": self.action_feed,
+            "open": self.action_open,
+            "search": self.action_search,
+            "like": self.action_like,
+            "comment": self.action_comment,
+            "popular": self.action_popular,
+            "login": self.action_login,
+            "explain": self.action_explain,
+        }
+
+    async def call(self, recorder: Recorder, label: str, method: str, path: str,
+                   user: Optional[Dict] = None, **kwargs) -> Optional[httpx.Response]:
+        """Time one request, body included; None when the request itself failed"""
+        headers = kwargs.pop("headers", {})
+        if user:
+            headers["Authorization"] = f"Bearer {user['token']}"
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            recorder.add(label, time.perf_counter() - started, "error")
+            return None
+        recorder.add(label, time.perf_counter() - started, response.status_code)
+        return response
+
+    # Seeding
+    async def register(self, index: int, recorder: Recorder):
+        user = {
+            "email": f"bench{index}@b{self.run_id}.oyunyaz.dev",
+            "username": f"bench{self.run_id}_{index}",
+            "password": f"bench-password-{index}",
+        }
+        response = await self.call(recorder, "POST /api/auth/register", "POST", "/api/auth/register", json=user)
+        if response is None or response.status_code != 200:
+            raise RuntimeError(f"Registering {user['email']} failed: {response.text if response else 'no response'}")
+        data = response.json()
+        self.users.append({**user, "id": data["user"]["id"], "token": data["access_token"]})
+
+    async def create_review(self, rng: random.Random, recorder: Recorder):
+        game_name, category = rng.choice(GAMES)
+        body = {
+            "title": f"{game_name} {rng.choice(WORDS)} incelemesi",
+            "content": paragraphs(rng, rng.randint(3, 8)),
+            "game_name": game_name,
+            "category": category,
+            "tags": rng.sample(WORDS, 3),
+            "rating": rng.randint(1, 10),
+        }
+        response = await self.call(recorder, "POST /api/reviews", "POST", "/api/reviews", rng.choice(self.users), json=body)
+        if response is not None and response.status_code == 200:
+            self.review_ids.append(response.json()["id"])
+
+    async def seed(self):
+        print(f"🌱 Seeding {self.args.users} users, {self.args.reviews} reviews, {self.args.comments} comments...")
+        rng = random.Random(self.args.seed)
+        recorder = Recorder()
+        started = time.perf_counter()
+
+        await bounded_gather([self.register(i, recorder) for i in range(self.args.users)], 16)
+        await bounded_gather(
+            [self.create_review(random.Random(rng.random()), recorder) for _ in range(self.args.reviews)], 16
+        )
+        await bounded_gather([
+            self.call(recorder, "POST /api/reviews/{id}/comments", "POST",
+                      f"/api/reviews/{rng.choice(self.review_ids)}/comments", rng.choice(self.users),
+                      json={"content": " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 40)))})
+            for _ in range(self.args.comments)
+        ], 16)
+
+        # Popularity is skewed: a few reviews get most of the opens and likes
+        self.review_cum_weights = []
+        total = 0.0
+        for rank in range(len(self.review_ids)):
+            total += 1 / (rank + 1)
+            self.review_cum_weights.append(total)
+
+        elapsed = time.perf_counter() - started
+        print(f"   done in {elapsed:.1f}s")
+        return recorder.summary(elapsed)
+
+    def pick_review(self, rng: random.Random) -> str:
+        return rng.choices(self.review_ids, cum_weights=self.review_cum_weights)[0]
+
+    # Actions
+    async def action_feed(self, rng, user, recorder):
+        params = {"limit": 10}
+        if rng.random() < 0.3:
+            params["category"] = rng.choice(GAMES)[1]
+        response = await self.call(recorder, "GET /api/reviews", "GET", "/api/reviews", params=params)
+        # Some readers keep scrolling through keyset pages
+        while response is not None and response.headers.get("x-next-cursor") and rng.random() < 0.4:
+            params = {**params, "cursor": response.headers["x-next-cursor"]}
+            response = await self.call(recorder, "GET /api/reviews (cursor)", "GET", "/api/reviews", params=params)
+
+    async def action_open(self, rng, user, recorder):
+        review_id = self.pick_review(rng)
+        await self.call(recorder, "GET /api/reviews/{id}/page", "GET", f"/api/reviews/{review_id}/page",
+                        user if rng.random() < 0.5 else None)
+
+    async def action_search(self, rng, user, recorder):
+        # Typeahead: one request per keystroke once two characters are typed
+        term = rng.choice(GAMES)[0]
+        for length in range(2, min(len(term), 6) + 1):
+            await self.call(recorder, "GET /api/search", "GET", "/api/search", params={"q": term[:length], "limit": 5})
+
+    async def action_like(self, rng, user, recorder):
+        await self.call(recorder, "POST /api/reviews/{id}/like", "POST", f"/api/reviews/{self.pick_review(rng)}/like", user)
+
+    async def action_comment(self, rng, user, recorder):
+        await self.call(recorder, "POST /api/reviews/{id}/comments", "POST",
+                        f"/api/reviews/{self.pick_review(rng)}/comments", user,
+                        json={"content": " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 40)))})
+
+    async def action_popular(self, rng, user, recorder):
+        await self.call(recorder, "GET /api/popular-games", "GET", "/api/popular-games")
+
+    async def action_login(self, rng, user, recorder):
+        await self.call(recorder, "POST /api/auth/login", "POST", "/api/auth/login",
+                        json={"email": user["email"], "password": user["password"]})
+
+    async def action_explain(self, rng, user, recorder):
+        await self.call(recorder, "POST /api/ai/explain", "POST", "/api/ai/explain",
+                        json={"word": rng.choice(WORDS), "review_id": self.pick_review(rng)})
+
+    async def run_workers(self, weights: Dict[str, int], concurrency: int, duration: float,
+                          recorder: Recorder, seed_offset: int = 0) -> float:
+        """Closed-loop workers, each repeatedly running a weighted random action until the deadline"""
+        names, action_weights = list(weights), list(weights.values())
+        deadline = time.perf_counter() + duration
+
+        async def worker(index: int):
+            rng = random.Random(self.args.seed + seed_offset + index)
+            user = self.users[(seed_offset + index) % len(self.users)]
+            while time.perf_counter() < deadline:
+                action = rng.choices(names, weights=action_weights)[0]
+                await self.actions[action](rng, user, recorder)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return time.perf_counter() - started
+
+    # Scenarios
+    async def scenario_mixed(self) -> Dict:
+        recorder = Recorder()
+        elapsed = await self.run_workers(MIXED_WEIGHTS, self.args.concurrency, self.args.duration, recorder)
+        return {"duration_s": round(elapsed, 2), "endpoints": recorder.summary(elapsed)}
+
+    async def scenario_login_burst(self) -> Dict:
+        # Phase 1: feed readers alone; phase 2: the same readers next to a login burst
+        half = self.args.duration / 2
+        baseline = Recorder("baseline: ")
+        baseline_elapsed = await self.run_workers({"feed": 1}, self.args.concurrency, half, baseline)
+
+        burst = Recorder("burst: ")
+        burst_elapsed, _ = await asyncio.gather(
+            self.run_workers({"feed": 1}, self.args.concurrency, half, burst),
+            self.run_workers({"login": 1}, self.args.burst_concurrency, half, burst, seed_offset=10000),
+        )
+
+        endpoints = {**baseline.summary(baseline_elapsed), **burst.summary(burst_elapsed)}
+        before = endpoints.get("baseline: GET /api/reviews", {}).get("p99_ms", 0)
+        after = endpoints.get("burst: GET /api/reviews", {}).get("p99_ms", 0)
+        return {
+            "duration_s": round(baseline_elapsed + burst_elapsed, 2),
+            "feed_p99_increase_pct": round((after - before) / before * 100, 1) if before else None,
+            "endpoints": endpoints,
+        }
+
+    async def scenario_like_stress(self) -> Dict:
+        hot = self.review_ids[:self.args.hot_reviews]
+        recorder = Recorder()
+        deadline = time.perf_counter() + self.args.duration
+
+        async def worker(index: int):
+            rng = random.Random(self.args.seed + 20000 + index)
+            user = self.users[index % len(self.users)]
+            while time.perf_counter() < deadline:
+                await self.call(recorder, "POST /api/reviews/{id}/like", "POST",
+                                f"/api/reviews/{rng.choice(hot)}/like", user)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(self.args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+        # Every toggle must have moved likes_count exactly once
+        checks = {}
+        for review_id in hot:
+            review = await self.db.reviews.find_one({"id": review_id}, {"_id": 0, "likes_count": 1, "game_name": 1})
+            like_docs = await self.db.likes.count_documents({"review_id": review_id})
+            api = (await self.client.get(f"/api/reviews/{review_id}")).json()
+            likes_count = review["likes_count"] if review else None
+            checks[review_id] = {
+                "likes_count": likes_count,
+                "like_documents": like_docs,
+                "api_likes_count": api.get("likes_count"),
+                "ok": likes_count is not None and likes_count == like_docs == api.get("likes_count"),
+            }
+
+        game_checks = {}
+        for game_name in {g for g, _ in GAMES}:
+            totals = await self.db.reviews.aggregate([
+                {"$match": {"game_name": game_name}},
+                {"$group": {"_id": None, "likes": {"$sum": "$likes_count"}}},
+            ]).to_list(1)
+            stats = await self.db.game_stats.find_one({"_id": game_name})
+            if totals or stats:
+                expected = totals[0]["likes"] if totals else 0
+                actual = stats["total_likes"] if stats else 0
+                game_checks[game_name] = {"reviews_total_likes": expected, "game_stats_total_likes": actual,
+                                          "ok": expected == actual}
+
+        mismatches = sum(not c["ok"] for c in checks.values()) + sum(not c["ok"] for c in game_checks.values())
+        return {
+            "duration_s": round(elapsed, 2),
+            "hot_reviews": len(hot),
+            "mismatches": mismatches,
+            "reviews": checks,
+            "game_stats": game_checks,
+            "endpoints": recorder.summary(elapsed),
+        }
+
+    async def scenario_payload(self) -> Dict:
+        recorder = Recorder()
+        sizes = {}
+        started = time.perf_counter()
+        for fields in ("summary", "full"):
+            for encoding in ("identity", "gzip", "br"):
+                label = f"GET /api/reviews fields={fields} {encoding}"
+                wire, decoded = [], []
+                for _ in range(self.args.payload_requests):
+                    response = await self.call(recorder, label, "GET", "/api/reviews",
+                                               params={"limit": 20, "fields": fields},
+                                               headers={"Accept-Encoding": encoding})
+                    if response is not None:
+                        wire.append(response.num_bytes_downloaded)
+                        decoded.append(len(response.content))
+                if wire:
+                    sizes[f"{fields}/{encoding}"] = {
+                        "wire_bytes": round(sum(wire) / len(wire)),
+                        "json_bytes": round(sum(decoded) / len(decoded)),
+                    }
+        elapsed = time.perf_counter() - started
+        return {"duration_s": round(elapsed, 2), "sizes": sizes, "endpoints": recorder.summary(elapsed)}
+
+    async def run(self, scenarios: List[str]) -> Dict:
+        limits = httpx.Limits(max_connections=self.args.concurrency + self.args.burst_concurrency + 16)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=60, limits=limits) as client:
+            self.client = client
+            results = {"seed": {"endpoints": await self.seed()}}
+            runners = {
+                "mixed": self.scenario_mixed,
+                "login-burst": self.scenario_login_burst,
+                "like-stress": self.scenario_like_stress,
+                "payload": self.scenario_payload,
+            }
+            for name in scenarios:
+                print(f"\n🚀 {name} (concurrency {self.args.concurrency}, {self.args.duration:g}s)")
+                results[name] = await runners[name]()
+                print_endpoint_table(results[name]["endpoints"])
+                if name == "login-burst":
+                    print(f"   feed p99 change under login burst: {results[name]['feed_p99_increase_pct']}%")
+                elif name == "like-stress":
+                    status = "✅" if results[name]["mismatches"] == 0 else "❌"
+                    print(f"   {status} counter mismatches: {results[name]['mismatches']}")
+                elif name == "payload":
+                    for key, size in results[name]["sizes"].items():
+                        print(f"   {key:<20} wire {size['wire_bytes']:>8} B   json {size['json_bytes']:>8} B")
+            return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=["mixed", "login-burst", "like-stress", "payload", "all"], default="all")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--burst-concurrency", type=int, default=32, help="login workers in login-burst")
+    parser.add_argument("--duration", type=float, default=20, help="seconds per scenario")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--reviews", type=int, default=500)
+    parser.add_argument("--comments", type=int, default=1000)
+    parser.add_argument("--hot-reviews", type=int, default=5, help="reviews targeted by like-stress")
+    parser.add_argument("--payload-requests", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", help=f"defaults to a fresh {BENCH_DB_PREFIX}<time> database; "
+                                          f"with --base-url, the database that server uses ({BENCH_DB_PREFIX}*)")
+    parser.add_argument("--base-url", help="benchmark an already running server instead of booting one")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--bcrypt-rounds", type=int, help="override BCRYPT_ROUNDS for the booted server")
+    parser.add_argument("--keep-db", action="store_true", help="do not drop the benchmark database afterwards")
+    parser.add_argument("--output", help="result file, defaults to benchmarks/results/load-<time>.json")
+    parser.add_argument("--compare", help="earlier result file to diff against")
+    parser.add_argument("--regression-threshold", type=float, default=10, help="percent change counted as a regression")
+    args = parser.parse_args()
+    # like-stress reads counters straight from the server's database
+    if args.base_url and not args.db_name:
+        parser.error("--base-url requires --db-name, the database the running server uses")
+    # Seeded data is never removed from a running server's database
+    if args.base_url and not args.db_name.startswith(BENCH_DB_PREFIX):
+        parser.error(f"--base-url only runs against benchmark databases, named {BENCH_DB_PREFIX}*")
+    return args
+
+
+async def main():
+    args = parse_args()
+    scenarios = ["mixed", "login-burst", "like-stress", "payload"] if args.scenario == "all" else [args.scenario]
+    db_name = args.db_name or f"{BENCH_DB_PREFIX}{int(time.time())}"
+    mongo = AsyncIOMotorClient(args.mongo_url, tz_aware=True)
+
+    env = {
+        "MONGO_URL": args.mongo_url,
+        "DB_NAME": db_name,
+        "LLM_STUB": "true",
+        "EMERGENT_LLM_KEY": "bench",
+        "JWT_SECRET": "bench-secret",
+        # The AI limiter would otherwise dominate the explain numbers
+        "AI_RATE_PER_MINUTE": "1000000",
+        "AI_RATE_BURST": "1000000",
+    }
+    if args.bcrypt_rounds:
+        env["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+
+    try:
+        if args.base_url:
+            await wait_until_ready(args.base_url)
+            results = await LoadTest(args, args.base_url, mongo[db_name]).run(scenarios)
+        else:
+            print(f"🔧 Starting server on port {args.port} with database {db_name}")
+            async with ServerProcess(args.port, env) as server:
+                results = await LoadTest(args, server.base_url, mongo[db_name]).run(scenarios)
+    finally:
+        if not args.base_url and not args.keep_db:
+            await mongo.drop_database(db_name)
+        mongo.close()
+
+    output = {"meta": run_metadata("load", {**vars(args), "db_name": db_name}), "scenarios": results}
+    path = save_results("load", output, args.output)
+    print(f"\n💾 Results saved to {path}")
+
+    failed = any(results.get(name, {}).get("mismatches") for name in scenarios)
+    if args.compare:
+        regressions = compare_results(json.loads(Path(args.compare).read_text()), output, args.regression_threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions over {args.regression_threshold:g}%:")
+            for regression in regressions:
+                print(f"   {regression}")
+            failed = True
+        else:
+            print("\n✅ No regressions")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
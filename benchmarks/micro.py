@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the Oyun Yazarlari backend
+
+Runs against the backend modules directly, without HTTP:
+  serialization   100-review list: response_model validation + json vs
+                  pydantic dump_json vs the orjson path used by list routes
+  prompt-tokens   prompt size before/after context windowing for
+                  /ai/explain and /ai/assist at several review lengths
+  compression     wire bytes and CPU per response for gzip levels and
+                  brotli qualities on feed and comment pages
+  popular-games   on-read $group aggregate vs the materialized game_stats
+                  leaderboard at 10k/100k/1M reviews (needs a local mongod)
+
+Results are saved as JSON under benchmarks/results/ (or --output).
+
+    python benchmarks/micro.py
+    python benchmarks/micro.py --bench popular-games --sizes 10000,100000,1000000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from report import ROOT_DIR, run_metadata, save_results
+
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+from load_test import GAMES, WORDS, paragraphs  # noqa: E402
+
+# The popular-games pipeline as it ran on every request before game_stats existed
+ON_READ_POPULAR_GAMES = [
+    {
+        "$group": {
+            "_id": "$game_name",
+            "review_count": {"$sum": 1},
+            "total_likes": {"$sum": "$likes_count"},
+            "avg_rating": {"$avg": "$rating"},
+            "cover_image": {"$first": "$cover_image"},
+        }
+    },
+    {
+        "$addFields": {
+            "popularity_score": {
+                "$add": [
+                    {"$multiply": ["$review_count", 10]},
+                    {"$multiply": ["$total_likes", 5]},
+                    {"$multiply": [{"$ifNull": ["$avg_rating", 0]}, 2]},
+                ]
+            }
+        }
+    },
+    {"$sort": {"popularity_score": -1}},
+    {"$limit": 3},
+]
+
+
+def time_call(func: Callable, iterations: int, repeats: int = 5, clock=time.perf_counter) -> float:
+    """Median seconds per call over repeats"""
+    samples = []
+    for _ in range(repeats):
+        started = clock()
+        for _ in range(iterations):
+            func()
+        samples.append((clock() - started) / iterations)
+    return statistics.median(samples)
+
+
+def make_reviews(server, rng: random.Random, count: int, paragraph_count=(3, 8)) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    reviews = []
+    for index in range(count):
+        game_name, category = rng.choice(GAMES)
+        content = paragraphs(rng, rng.randint(*paragraph_count))
+        review = server.Review(
+            title=f"{game_name} {rng.choice(WORDS)} incelemesi",
+            content=content,
+            excerpt=server.make_excerpt(content),
+            game_name=game_name,
+            category=category,
+            tags=rng.sample(WORDS, 3),
+            rating=rng.randint(1, 10),
+            author_id=str(uuid.uuid4()),
+            author_username=f"yazar{index}",
+            likes_count=rng.randint(0, 500),
+            comments_count=rng.randint(0, 80),
+            created_at=now - timedelta(minutes=index),
+            updated_at=now - timedelta(minutes=index),
+        )
+        reviews.append(review.model_dump())
+    return reviews
+
+
+def bench_serialization(server, args) -> Dict:
+    from pydantic import TypeAdapter
+
+    rng = random.Random(args.seed)
+    full = make_reviews(server, rng, 100)
+    summary_fields = set(server.ReviewSummary.model_fields)
+    summary = [{k: v for k, v in review.items() if k in summary_fields} for review in full]
+
+    results = {}
+    for name, model, docs in (("full", server.Review, full), ("summary", server.ReviewSummary, summary)):
+        adapter = TypeAdapter(List[model])
+        variants = {
+            # What FastAPI does with response_model: validate, to jsonable, json.dumps
+            "response_model": lambda: json.dumps(
+                adapter.dump_python(adapter.validate_python(docs), mode="json"),
+                ensure_ascii=False, allow_nan=False, separators=(",", ":")
+            ).encode(),
+            "pydantic_dump_json": lambda: adapter.dump_json(adapter.validate_python(docs)),
+            "orjson": lambda: server.dump_json(docs),
+        }
+        results[name] = {
+            variant: {
+                "us_per_call": round(time_call(func, args.iterations) * 1e6, 1),
+                "bytes": len(func()),
+            }
+            for variant, func in variants.items()
+        }
+    return results
+
+
+def bench_prompt_tokens(server, args) -> Dict:
+    from prompt_context import estimate_tokens, find_term, relevant_section, window_around
+
+    rng = random.Random(args.seed)
+    results = {}
+    for paragraph_count in (4, 12, 40):
+        content = paragraphs(rng, paragraph_count)
+        # Explain: the selected term sits in the middle of the review
+        term = content[len(content) // 2:].split()[1].strip(".")
+        offset = find_term(content[len(content) // 2:], term) + len(content) // 2
+        explain_context = window_around(content, offset, server.EXPLAIN_CONTEXT_TOKENS)
+
+        # Assist: the request names words from one paragraph of the draft
+        request = " ".join(rng.sample(content.split("\n\n")[paragraph_count // 3].split(), 4))
+        assist_context = relevant_section(content, request, server.ASSIST_CONTEXT_TOKENS)
+
+        results[f"{paragraph_count}_paragraphs"] = {
+            "review_chars": len(content),
+            "explain_tokens_before": estimate_tokens(content),
+            "explain_tokens_after": estimate_tokens(explain_context),
+            "assist_tokens_before": estimate_tokens(content),
+            "assist_tokens_after": estimate_tokens(assist_context),
+        }
+    return results
+
+
+def bench_compression(server, args) -> Dict:
+    from compression import Compressor
+
+    rng = random.Random(args.seed)
+    reviews = make_reviews(server, rng, 20)
+    summary_fields = set(server.ReviewSummary.model_fields)
+    comments = [
+        server.Comment(
+            review_id=reviews[0]["id"], author_id=str(uuid.uuid4()), author_username=f"okur{i}",
+            content=" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 40)))
+        ).model_dump()
+        for i in range(50)
+    ]
+    bodies = {
+        "feed_summary_20": server.dump_json([{k: v for k, v in r.items() if k in summary_fields} for r in reviews]),
+        "feed_full_20": server.dump_json(reviews),
+        "comments_50": server.dump_json(comments),
+    }
+    settings = [("gzip", level, None) for level in (1, 6, 9)] + [("br", None, quality) for quality in (1, 4, 6, 11)]
+
+    results = {}
+    for body_name, body in bodies.items():
+        rows = {"identity": {"bytes": len(body)}}
+        for encoding, level, quality in settings:
+            def compress():
+                compressor = Compressor(encoding, level or 6, quality or 4)
+                return compressor.compress_chunk(body) + compressor.finish()
+
+            size = len(compress())
+            rows[f"{encoding}-{level or quality}"] = {
+                "bytes": size,
+                "ratio": round(len(body) / size, 2),
+                "cpu_us_per_response": round(time_call(compress, max(args.iterations // 10, 5), clock=time.process_time) * 1e6, 1),
+            }
+        results[body_name] = rows
+    return results
+
+
+async def bench_popular_games(server, args) -> Dict:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo.errors import ServerSelectionTimeoutError
+
+    client = AsyncIOMotorClient(args.mongo_url, tz_aware=True, serverSelectionTimeoutMS=3000)
+    try:
+        await client.admin.command("ping")
+    except ServerSelectionTimeoutError:
+        print(f"⚠️  No mongod at {args.mongo_url}; skipping popular-games")
+        return {"skipped": f"no mongod at {args.mongo_url}"}
+
+    rng = random.Random(args.seed)
+    # A long tail of games with a few very popular ones
+    games = [f"Oyun {i}" for i in range(500)]
+    game_weights = [1 / (rank + 1) for rank in range(len(games))]
+    db_name = f"oyunyaz_micro_{int(time.time())}"
+    db = client[db_name]
+    server.db = db
+    results = {}
+
+    async def median_ms(func, repeats: int) -> float:
+        samples = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            await func()
+            samples.append(time.perf_counter() - started)
+        return round(statistics.median(samples) * 1000, 2)
+
+    try:
+        inserted = 0
+        for size in sorted(int(s) for s in args.sizes.split(",")):
+            print(f"   seeding {size} reviews...")
+            while inserted < size:
+                batch = min(10000, size - inserted)
+                await db.reviews.insert_many([
+                    {
+                        "id": str(uuid.uuid4()),
+                        "game_name": rng.choices(games, weights=game_weights)[0],
+                        "likes_count": rng.randint(0, 200),
+                        "rating": rng.choice([None, *range(1, 11)]),
+                        "cover_image": None,
+                        "created_at": datetime.now(timezone.utc),
+                    }
+                    for _ in range(batch)
+                ], ordered=False)
+                inserted += batch
+
+            started = time.perf_counter()
+            await server.rebuild_game_stats()
+            rebuild_ms = round((time.perf_counter() - started) * 1000, 2)
+            await db.game_stats.create_index([("popularity_score", -1)])
+
+            on_read = await db.reviews.aggregate(ON_READ_POPULAR_GAMES).to_list(3)
+            materialized = await db.game_stats.find({}).sort("popularity_score", -1).limit(3).to_list(3)
+            game = rng.choice(games)
+            results[str(size)] = {
+                "on_read_aggregate_ms": await median_ms(lambda: db.reviews.aggregate(ON_READ_POPULAR_GAMES).to_list(3), args.repeats),
+                "materialized_read_ms": await median_ms(
+                    lambda: db.game_stats.find({}).sort("popularity_score", -1).limit(3).to_list(3), args.repeats * 10
+                ),
+                "incremental_update_ms": await median_ms(
+                    lambda: server.update_game_stats(game, {"total_likes": 1}), args.repeats * 10
+                ),
+                "full_rebuild_ms": rebuild_ms,
+                "same_top_games": [g["_id"] for g in on_read] == [g["_id"] for g in materialized],
+            }
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bench", choices=["serialization", "prompt-tokens", "compression", "popular-games", "all"], default="all")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="review counts for popular-games")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--output", help="result file, defaults to benchmarks/results/micro-<time>.json")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    benches = ["serialization", "prompt-tokens", "compression", "popular-games"] if args.bench == "all" else [args.bench]
+
+    # server.py reads its settings at import; nothing connects until a query runs
+    os.environ.setdefault("MONGO_URL", args.mongo_url)
+    os.environ.setdefault("DB_NAME", "oyunyaz_micro")
+    os.environ.setdefault("LLM_STUB", "true")
+    import server
+
+    results = {}
+    for name in benches:
+        print(f"\n🔬 {name}")
+        if name == "serialization":
+            results[name] = bench_serialization(server, args)
+        elif name == "prompt-tokens":
+            results[name] = bench_prompt_tokens(server, args)
+        elif name == "compression":
+            results[name] = bench_compression(server, args)
+        else:
+            results[name] = asyncio.run(bench_popular_games(server, args))
+        print(json.dumps(results[name], indent=2, ensure_ascii=False))
+
+    path = save_results("micro", {"meta": run_metadata("micro", vars(args)), "benchmarks": results}, args.output)
+    print(f"\n💾 Results saved to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Shared result handling for the benchmark scripts: latency summaries,
+JSON result files and run-to-run comparison.
+"""
+
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"
+
+# Lower is better for latencies, higher for throughput
+COMPARED_METRICS = {"p50_ms": -1, "p95_ms": -1, "p99_ms": -1, "rps": 1}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0, statuses: Optional[Dict[str, int]] = None) -> Dict:
+    """Summarize per-request latencies (seconds) measured over elapsed wall-clock seconds"""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "count": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(values) / count * 1000, 2) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if count else 0.0,
+        "statuses": dict(sorted((statuses or {}).items())),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(kind: str, args: Dict) -> Dict:
+    return {
+        "kind": kind,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": args,
+    }
+
+
+def save_results(kind: str, results: Dict, output: Optional[str] = None) -> Path:
+    if output:
+        path = Path(output)
+    else:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = RESULTS_DIR / f"{kind}-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, ensure_ascii=False, default=str))
+    return path
+
+
+def compare_results(old: Dict, new: Dict, threshold_pct: float) -> List[str]:
+    """Print endpoint-level deltas between two load-test result files and return the regressions"""
+    regressions = []
+    for scenario, new_scenario in new.get("scenarios", {}).items():
+        old_scenario = old.get("scenarios", {}).get(scenario)
+        if not old_scenario:
+            continue
+        print(f"\n📊 {scenario}")
+        for endpoint, new_stats in new_scenario.get("endpoints", {}).items():
+            old_stats = old_scenario.get("endpoints", {}).get(endpoint)
+            if not old_stats:
+                continue
+            cells = []
+            for metric, direction in COMPARED_METRICS.items():
+                before, after = old_stats.get(metric, 0), new_stats.get(metric, 0)
+                if not before:
+                    continue
+                change = (after - before) / before * 100
+                cells.append(f"{metric} {before:g}→{after:g} ({change:+.1f}%)")
+                if change * direction < -threshold_pct:
+                    regressions.append(f"{scenario} / {endpoint}: {metric} {change:+.1f}%")
+            print(f"   {endpoint:<42} " + "  ".join(cells))
+    return regressions
+
+
+def print_endpoint_table(endpoints: Dict[str, Dict]):
+    print(f"   {'endpoint':<42} {'count':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint, stats in endpoints.items():
+        print(
+            f"   {endpoint:<42} {stats['count']:>7} {stats['errors']:>5} {stats['rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
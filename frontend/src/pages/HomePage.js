@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { motion } from 'framer-motion';
@@ -9,6 +9,7 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@
 import { Heart, MessageCircle, User, Calendar, Gamepad2, Trophy, Star, Zap, Flame, Crown } from 'lucide-react';
 import { format } from 'date-fns';
 import { tr } from 'date-fns/locale';
+import { useAuth } from '../context/AuthContext';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -21,8 +22,12 @@ const HomePage = () => {
   const [loading, setLoading] = useState(true);
   const [currentPage, setCurrentPage] = useState(1);
   const [totalReviews, setTotalReviews] = useState(0);
+  const [likedIds, setLikedIds] = useState(new Set());
   const reviewsPerPage = 10;
+  // Cursor for each page we have already seen, keyed by `${category}:${page}`
+  const pageCursors = useRef({});
   const navigate = useNavigate();
+  const { user } = useAuth();
 
   const totalPages = Math.ceil(totalReviews / reviewsPerPage);
 
@@ -37,6 +42,10 @@ const HomePage = () => {
     setCurrentPage(1);
   }, [selectedCategory]);
 
+  useEffect(() => {
+    fetchLikeStatus(reviews);
+  }, [user]);
+
   const fetchCategories = async () => {
     try {
       const response = await axios.get(`${API}/categories`);
@@ -50,18 +59,28 @@ const HomePage = () => {
     try {
       setLoading(true);
       const skip = (currentPage - 1) * reviewsPerPage;
+      const cursor = pageCursors.current[`${selectedCategory}:${currentPage}`];
+      // Use the keyset cursor when we reached this page sequentially, fall back to skip for jumps
+      const pagination = cursor
+        ? `cursor=${encodeURIComponent(cursor)}&limit=${reviewsPerPage}`
+        : `skip=${skip}&limit=${reviewsPerPage}`;
       const url = selectedCategory === 'all' 
-        ? `${API}/reviews?skip=${skip}&limit=${reviewsPerPage}`
-        : `${API}/reviews?category=${selectedCategory}&skip=${skip}&limit=${reviewsPerPage}`;
+        ? `${API}/reviews?${pagination}`
+        : `${API}/reviews?category=${selectedCategory}&${pagination}`;
       const response = await axios.get(url);
       setReviews(response.data);
+      fetchLikeStatus(response.data);
+      const nextCursor = response.headers['x-next-cursor'];
+      if (nextCursor) {
+        pageCursors.current[`${selectedCategory}:${currentPage + 1}`] = nextCursor;
+      }
       
       // Get total count
       const countUrl = selectedCategory === 'all'
-        ? `${API}/reviews`
-        : `${API}/reviews?category=${selectedCategory}`;
+        ? `${API}/reviews/count`
+        : `${API}/reviews/count?category=${selectedCategory}`;
       const countResponse = await axios.get(countUrl);
-      setTotalReviews(countResponse.data.length);
+      setTotalReviews(countResponse.data.count);
     } catch (error) {
       console.error('Failed to fetch reviews:', error);
       setReviews([]);
@@ -70,6 +89,22 @@ const HomePage = () => {
     }
   };
 
+  const fetchLikeStatus = async (pageReviews) => {
+    if (!user || pageReviews.length === 0) {
+      setLikedIds(new Set());
+      return;
+    }
+    try {
+      // One lookup for the whole page instead of a /liked call per card
+      const response = await axios.post(`${API}/likes/status`, {
+        review_ids: pageReviews.map((review) => review.id)
+      });
+      setLikedIds(new Set(response.data.liked));
+    } catch (error) {
+      console.error('Failed to fetch like status:', error);
+    }
+  };
+
   const fetchPopularGames = async () => {
     try {
       const response = await axios.get(`${API}/popular-games?limit=3`);
@@ -377,7 +412,7 @@ const HomePage = () => {
                         </p>
                         
                         <p className="text-foreground/70 dark:text-gray-300 line-clamp-2 leading-relaxed mb-4">
-                          {review.content}
+                          {review.excerpt}
                         </p>
                         
                         {review.tags && review.tags.length > 0 && (
@@ -406,7 +441,7 @@ const HomePage = () => {
                           
                           <div className="flex gap-2">
                             <div className="bg-white/20 backdrop-blur-sm rounded-xl px-3 py-2 flex items-center gap-1">
-                              <Heart className="w-4 h-4" />
+                              <Heart className={`w-4 h-4 ${likedIds.has(review.id) ? 'fill-white' : ''}`} />
                               <span className="font-bold text-sm">{review.likes_count}</span>
                             </div>
                             <div className="bg-white/20 backdrop-blur-sm rounded-xl px-3 py-2 flex items-center gap-1">
@@ -18,6 +18,7 @@ const API = `${BACKEND_URL}/api`;
 const ReviewDetailPage = () => {
   const [review, setReview] = useState(null);
   const [comments, setComments] = useState([]);
+  const [commentsCursor, setCommentsCursor] = useState(null);
   const [newComment, setNewComment] = useState('');
   const [liked, setLiked] = useState(false);
   const [loading, setLoading] = useState(true);
@@ -30,17 +31,18 @@ const ReviewDetailPage = () => {
   const navigate = useNavigate();
 
   useEffect(() => {
-    fetchReview();
-    fetchComments();
-    if (user) {
-      checkLiked();
-    }
+    fetchPage();
   }, [id, user]);
 
-  const fetchReview = async () => {
+  const fetchPage = async () => {
     try {
-      const response = await axios.get(`${API}/reviews/${id}`);
-      setReview(response.data);
+      // Review, first comments page and (when logged in) like state in one request
+      const include = user ? 'review,comments,liked' : 'review,comments';
+      const response = await axios.get(`${API}/reviews/${id}/page?include=${include}`);
+      setReview(response.data.review);
+      setComments(response.data.comments);
+      setCommentsCursor(response.data.next_cursor || null);
+      setLiked(Boolean(response.data.liked));
     } catch (error) {
       toast.error('İnceleme bulunamadı!');
       navigate('/');
@@ -49,24 +51,16 @@ const ReviewDetailPage = () => {
     }
   };
 
-  const fetchComments = async () => {
+  const fetchMoreComments = async (cursor) => {
     try {
-      const response = await axios.get(`${API}/reviews/${id}/comments`);
-      setComments(response.data);
+      const response = await axios.get(`${API}/reviews/${id}/comments?cursor=${encodeURIComponent(cursor)}`);
+      setComments(prev => [...prev, ...response.data]);
+      setCommentsCursor(response.headers['x-next-cursor'] || null);
     } catch (error) {
       console.error('Failed to fetch comments:', error);
     }
   };
 
-  const checkLiked = async () => {
-    try {
-      const response = await axios.get(`${API}/reviews/${id}/liked`);
-      setLiked(response.data.liked);
-    } catch (error) {
-      console.error('Failed to check like status:', error);
-    }
-  };
-
   const handleLike = async () => {
     if (!user) {
       toast.error('Beğenmek için giriş yapın!');
@@ -119,6 +113,31 @@ const ReviewDetailPage = () => {
     }
   };
 
+  // Code-point offset of the selection in review.content, read from the
+  // selection Range so repeated words are told apart. Each paragraph carries
+  // its start offset; the server counts code points, JS strings UTF-16 units.
+  const selectionOffset = (selection) => {
+    if (!selection.rangeCount) return undefined;
+    const range = selection.getRangeAt(0);
+    const node = range.startContainer;
+    const paragraph = node.nodeType === Node.TEXT_NODE ? node.parentElement.closest('[data-offset]') : null;
+    if (!paragraph) return undefined;
+    
+    const raw = selection.toString();
+    const leading = raw.length - raw.trimStart().length;
+    const unitOffset = Number(paragraph.dataset.offset) + range.startOffset + leading;
+    return Array.from(review.content.slice(0, unitOffset)).length;
+  };
+
+  const paragraphOffsets = (content) => {
+    let position = 0;
+    return content.split('\n\n').map((paragraph) => {
+      const start = position;
+      position += paragraph.length + 2;
+      return { paragraph, start };
+    });
+  };
+
   const handleWordSelect = async () => {
     const selection = window.getSelection();
     const text = selection.toString().trim();
@@ -129,9 +148,12 @@ const ReviewDetailPage = () => {
       setWordExplanation('');
       
       try {
+        // The server reads the review and trims the context around the word itself
+        const offset = selectionOffset(selection);
         const response = await axios.post(`${API}/ai/explain`, {
           word: text,
-          context: review.content
+          review_id: review.id,
+          ...(offset !== undefined && { offset })
         });
         setWordExplanation(response.data.explanation);
       } catch (error) {
@@ -300,8 +322,8 @@ const ReviewDetailPage = () => {
                 onMouseUp={handleWordSelect}
                 data-testid="review-content"
               >
-                {review.content.split('\n\n').map((paragraph, idx) => (
-                  <p key={idx} className="mb-4 text-foreground/90 dark:text-gray-200 leading-relaxed text-lg">
+                {paragraphOffsets(review.content).map(({ paragraph, start }, idx) => (
+                  <p key={idx} data-offset={start} className="mb-4 text-foreground/90 dark:text-gray-200 leading-relaxed text-lg">
                     {paragraph}
                   </p>
                 ))}
@@ -424,6 +446,18 @@ const ReviewDetailPage = () => {
                   </motion.div>
                 ))
               )}
+              {commentsCursor && (
+                <div className="text-center">
+                  <Button
+                    variant="outline"
+                    onClick={() => fetchMoreComments(commentsCursor)}
+                    className="rounded-xl"
+                    data-testid="load-more-comments-btn"
+                  >
+                    Daha fazla yorum yükle
+                  </Button>
+                </div>
+              )}
             </div>
           </div>
         </motion.div>
@@ -316,7 +316,7 @@ const UserProfilePage = () => {
                           </p>
                           
                           <p className="text-foreground/70 dark:text-gray-300 line-clamp-2 leading-relaxed mb-4">
-                            {review.content}
+                            {review.excerpt}
                           </p>
                           
                           <div className="flex items-center gap-4 text-sm">
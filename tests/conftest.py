@@ -0,0 +1,103 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# server.py reads its settings at import and connects lazily, so no mongod is
+# needed for tests that never reach the database
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "oyunyaz_test")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ["LLM_STUB"] = "true"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class HookedCollection:
+    """A collection whose ``method`` first awaits ``hook``, e.g. to land a concurrent write."""
+
+    def __init__(self, collection, method, hook):
+        self.collection = collection
+        self.method = method
+        self.hook = hook
+
+    def __getattr__(self, name):
+        target = getattr(self.collection, name)
+        if name != self.method:
+            return target
+
+        async def hooked(*args, **kwargs):
+            await self.hook(*args, **kwargs)
+            return await target(*args, **kwargs)
+        return hooked
+
+
+class HookedDb:
+    def __init__(self, db, collections):
+        self.db = db
+        self.collections = collections
+
+    def __getattr__(self, name):
+        return self.collections.get(name) or getattr(self.db, name)
+
+    def __getitem__(self, name):
+        return self.collections.get(name) or self.db[name]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """An in-memory database behind server.db, with fresh in-process caches and search indexes."""
+    from mongomock_motor import AsyncMongoMockClient
+
+    import server
+    from cache import ResponseCache
+    from search_index import SearchIndex
+
+    database = AsyncMongoMockClient(tz_aware=True)["oyunyaz_test"]
+    monkeypatch.setattr(server, "db", database)
+    monkeypatch.setattr(server, "list_db", database)
+    monkeypatch.setattr(server, "response_cache", ResponseCache())
+    monkeypatch.setattr(server, "principal_cache", ResponseCache())
+    monkeypatch.setattr(server, "explain_cache", ResponseCache())
+    monkeypatch.setattr(server, "review_index", SearchIndex(server.review_index.field_weights))
+    monkeypatch.setattr(server, "user_index", SearchIndex(server.user_index.field_weights))
+    return database
+
+
+@pytest.fixture
+def hook(db, monkeypatch):
+    """Make server.db.<collection>.<method> await hook(*args) before running."""
+    import server
+
+    def install(collection_name, method, callback):
+        collections = dict(server.db.collections) if isinstance(server.db, HookedDb) else {}
+        collections[collection_name] = HookedCollection(db[collection_name], method, callback)
+        monkeypatch.setattr(server, "db", HookedDb(db, collections))
+    return install
+
+
+@pytest.fixture
+def api(db):
+    from fastapi.testclient import TestClient
+
+    import server
+    return TestClient(server.app)
+
+
+@pytest.fixture
+def signup(api):
+    """Register a user through the API; returns (user, auth headers)."""
+    def register(username="yazar", email=None):
+        response = api.post("/api/auth/register", json={
+            "email": email or f"{username}@example.com", "username": username, "password": "gizli-parola"
+        })
+        assert response.status_code == 200, response.text
+        body = response.json()
+        return body["user"], {"Authorization": f"Bearer {body['access_token']}"}
+    return register
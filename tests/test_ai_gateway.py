@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from ai_gateway import AIGateway, GatewayRejected, TokenBuckets
+
+pytestmark = pytest.mark.anyio
+
+
+async def reply(value="ok", delay=0.0):
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_token_bucket_allows_burst_then_reports_wait():
+    buckets = TokenBuckets(rate_per_minute=60, burst=2)
+    assert buckets.take("a") == 0
+    assert buckets.take("a") == 0
+    assert 0 < buckets.take("a") <= 1
+    # Buckets are per client
+    assert buckets.take("b") == 0
+
+
+def test_token_bucket_evicts_oldest_clients():
+    buckets = TokenBuckets(rate_per_minute=60, burst=1, max_clients=2)
+    for key in ("a", "b", "c"):
+        buckets.take(key)
+    assert list(buckets.buckets) == ["b", "c"]
+
+
+async def test_rate_limited_client_gets_429_with_retry_after():
+    gateway = AIGateway(rate_per_minute=1, burst=1)
+    assert await gateway.call("client", reply) == "ok"
+
+    with pytest.raises(GatewayRejected) as rejected:
+        await gateway.call("client", reply)
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after >= 1
+    assert gateway.rejected["rate_limited"] == 1
+
+
+async def test_full_queue_gets_503():
+    gateway = AIGateway(max_concurrency=1, max_queue=0, rate_per_minute=1000, burst=1000)
+    running = asyncio.create_task(gateway.call("a", lambda: reply(delay=0.1)))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(GatewayRejected) as rejected:
+        await gateway.call("b", reply)
+    assert rejected.value.status_code == 503
+    assert gateway.rejected["queue_full"] == 1
+    assert await running == "ok"
+
+
+async def test_queue_timeout_gets_503():
+    gateway = AIGateway(max_concurrency=1, max_queue=1, queue_timeout=0.01, rate_per_minute=1000, burst=1000)
+    running = asyncio.create_task(gateway.call("a", lambda: reply(delay=0.1)))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(GatewayRejected) as rejected:
+        await gateway.call("b", reply)
+    assert rejected.value.status_code == 503
+    assert gateway.rejected["queue_timeout"] == 1
+    await running
+
+
+async def test_slow_upstream_call_gets_504_and_frees_the_slot():
+    gateway = AIGateway(max_concurrency=1, call_timeout=0.01)
+    with pytest.raises(GatewayRejected) as rejected:
+        await gateway.call("a", lambda: reply(delay=1))
+    assert rejected.value.status_code == 504
+    assert gateway.calls["timeout"] == 1
+    assert gateway.in_flight == 0
+    assert not gateway.semaphore.locked()
+
+
+async def test_stream_relays_chunks_and_releases_the_ticket():
+    observed = []
+    gateway = AIGateway(observer=lambda *args: observed.append(args[:2]))
+
+    async def chunks():
+        for chunk in ("a", "b"):
+            yield chunk
+
+    ticket = await gateway.admit("a", label="test_stream")
+    assert [chunk async for chunk in gateway.stream(ticket, chunks())] == ["a", "b"]
+    assert ticket.released
+    assert gateway.in_flight == 0
+    assert observed == [("test_stream", "ok")]
+
+
+async def test_stream_past_deadline_gets_504():
+    gateway = AIGateway(call_timeout=0.01)
+
+    async def chunks():
+        yield "a"
+        await asyncio.sleep(1)
+        yield "b"
+
+    ticket = await gateway.admit("a")
+    received = []
+    with pytest.raises(GatewayRejected) as rejected:
+        async for chunk in gateway.stream(ticket, chunks()):
+            received.append(chunk)
+    assert rejected.value.status_code == 504
+    assert received == ["a"]
+    assert gateway.in_flight == 0
+
+
+async def test_ticket_release_is_idempotent():
+    gateway = AIGateway(max_concurrency=1)
+    ticket = await gateway.admit("a")
+    ticket.release()
+    ticket.release()
+    assert gateway.in_flight == 0
+    assert not gateway.semaphore.locked()
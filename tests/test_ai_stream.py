@@ -0,0 +1,113 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import llm
+import server
+from ai_gateway import AIGateway
+from cache import ResponseCache
+
+
+class FakeCollection:
+    """Just enough of a Motor collection for the explanation store."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query, projection=None):
+        return self.docs.get(query.get("_id"))
+
+    async def update_one(self, query, update, upsert=False):
+        self.docs[query["_id"]] = {"_id": query["_id"], **update["$set"]}
+
+
+class FakeDb:
+    def __init__(self):
+        self.explanations = FakeCollection()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(llm, "STUB_TOKEN_DELAY", 0)
+    monkeypatch.setattr(server, "db", FakeDb())
+    monkeypatch.setattr(server, "explain_cache", ResponseCache())
+    monkeypatch.setattr(server, "ai_gateway", AIGateway(rate_per_minute=60, burst=2))
+    server.app.dependency_overrides[server.get_current_user] = lambda: server.User(
+        id="user-1", email="yazar@example.com", username="yazar"
+    )
+    yield TestClient(server.app)
+    server.app.dependency_overrides.clear()
+
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_assist_stream_emits_tokens_then_done(client):
+    response = client.post("/api/ai/assist/stream", json={"prompt": "Giriş paragrafı yaz", "context": "Taslak metin."})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+
+    events = parse_events(response.text)
+    tokens = [data["text"] for name, data in events if name == "token"]
+    assert len(tokens) > 1
+    assert "yerel test yanıtıdır" in "".join(tokens)
+    name, done = events[-1]
+    assert name == "done"
+    assert done.keys() == {"ttfb_ms", "total_ms"}
+    assert server.ai_gateway.in_flight == 0
+
+
+def test_explain_stream_stores_and_replays_the_explanation(client):
+    request = {"word": "nerf", "context": "Bu yamada silaha nerf geldi."}
+    first = parse_events(client.post("/api/ai/explain/stream", json=request).text)
+    streamed = "".join(data["text"] for name, data in first if name == "token")
+    assert server.ai_gateway.admitted == 1
+
+    # The second request is answered from the store without reaching the model
+    second = parse_events(client.post("/api/ai/explain/stream", json=request).text)
+    assert [data["text"] for name, data in second if name == "token"] == [streamed]
+    assert second[-1][0] == "done"
+    assert server.ai_gateway.admitted == 1
+
+
+def test_explain_without_context_or_review_is_rejected(client):
+    assert client.post("/api/ai/explain/stream", json={"word": "nerf"}).status_code == 400
+
+
+def test_explain_stream_over_budget_gets_429(client):
+    for word in ("buff", "nerf"):
+        assert client.post("/api/ai/explain/stream", json={"word": word, "context": f"{word} geldi."}).status_code == 200
+
+    response = client.post("/api/ai/explain/stream", json={"word": "meta", "context": "meta değişti."})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+
+
+def test_explain_budget_ignores_spoofed_forwarded_for(client):
+    codes = [
+        client.post(
+            "/api/ai/explain", json={"word": f"kelime{n}", "context": f"kelime{n} burada."},
+            headers={"X-Forwarded-For": f"10.0.0.{n}"}
+        ).status_code
+        for n in range(3)
+    ]
+    assert codes == [200, 200, 429]
+
+
+def test_failed_chat_construction_does_not_hold_a_slot(client, monkeypatch):
+    def broken_chat(session_id, system_message):
+        raise RuntimeError("bad model config")
+
+    monkeypatch.setattr(server, "create_chat", broken_chat)
+    failing = TestClient(server.app, raise_server_exceptions=False)
+    response = failing.post("/api/ai/assist/stream", json={"prompt": "Yaz"})
+    assert response.status_code == 500
+    assert server.ai_gateway.in_flight == 0
+    assert server.ai_gateway.admitted == 0
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from cache import ResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+class Loader:
+    def __init__(self, value="value"):
+        self.value = value
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.value
+
+
+async def start(cache, key, loader, ttl=60):
+    task = asyncio.create_task(cache.get_or_load(key, ttl, loader))
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = ResponseCache()
+    loader = Loader()
+    tasks = [await start(cache, "key", loader) for _ in range(5)]
+    loader.release.set()
+
+    assert await asyncio.gather(*tasks) == ["value"] * 5
+    assert loader.calls == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+async def test_loaded_value_is_served_from_cache():
+    cache = ResponseCache()
+    loader = Loader()
+    loader.release.set()
+    await cache.get_or_load("key", 60, loader)
+    await cache.get_or_load("key", 60, loader)
+
+    assert loader.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+async def test_expired_entries_reload():
+    cache = ResponseCache()
+    loader = Loader()
+    loader.release.set()
+    await cache.get_or_load("key", 0, loader)
+    await cache.get_or_load("key", 0, loader)
+    assert loader.calls == 2
+
+
+async def test_invalidation_during_load_skips_only_that_key():
+    cache = ResponseCache()
+    raced, unrelated = Loader("stale"), Loader("other")
+    raced_task = await start(cache, "reviews:a", raced)
+    unrelated_task = await start(cache, "popular-games:", unrelated)
+
+    cache.invalidate_prefix("reviews:")
+    raced.release.set()
+    unrelated.release.set()
+
+    # Waiters still get their result, but the raced load is not stored
+    assert await raced_task == "stale"
+    assert await unrelated_task == "other"
+    assert cache.get("reviews:a") is None
+    assert cache.get("popular-games:") == "other"
+
+
+async def test_request_after_invalidation_does_not_join_the_stale_load():
+    cache = ResponseCache()
+    stale, fresh = Loader("stale"), Loader("fresh")
+    stale_task = await start(cache, "key", stale)
+    cache.invalidate("key")
+    fresh_task = await start(cache, "key", fresh)
+
+    fresh.release.set()
+    stale.release.set()
+    assert await fresh_task == "fresh"
+    assert await stale_task == "stale"
+    assert cache.get("key") == "fresh"
+
+
+async def test_cancelled_leader_does_not_cancel_followers():
+    cache = ResponseCache()
+    loader = Loader()
+    leader = await start(cache, "key", loader)
+    follower = await start(cache, "key", loader)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    assert await follower == "value"
+    assert leader.cancelled()
+    assert cache.get("key") == "value"
+
+
+async def test_failed_load_propagates_and_is_not_cached():
+    cache = ResponseCache()
+
+    async def failing():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await cache.get_or_load("key", 60, failing)
+    assert cache.get("key") is None
+    assert cache.inflight == {}
+
+
+async def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1, 60)
+    cache.set("b", 2, 60)
+    cache.get("a")
+    cache.set("c", 3, 60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
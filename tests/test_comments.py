@@ -0,0 +1,53 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import server
+
+
+def thread(api, db, count):
+    # Spaced a second apart so the order does not hinge on the id tiebreak
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    asyncio.run(db.comments.insert_many([
+        {"id": f"comment-{n}", "review_id": "review-1", "author_id": "user-1", "author_username": "yazar",
+         "content": f"Yorum {n}", "created_at": start + timedelta(seconds=n)}
+        for n in range(count)
+    ]))
+    return "/api/reviews/review-1/comments"
+
+
+def ndjson(api, path, **params):
+    response = api.get(path, params={"format": "ndjson", **params})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_json_pages_and_the_stream_agree(api, db):
+    path = thread(api, db, 5)
+    streamed = [comment["id"] for comment in ndjson(api, path)]
+    assert len(streamed) == 5
+
+    paged, cursor = [], None
+    while True:
+        response = api.get(path, params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+        paged.extend(comment["id"] for comment in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert paged == streamed
+    # Newest first
+    assert ndjson(api, path)[0]["content"] == "Yorum 4"
+
+
+def test_stream_resumes_after_a_cursor(api, db):
+    path = thread(api, db, 4)
+    first = api.get(path, params={"limit": 1})
+    rest = ndjson(api, path, cursor=first.headers["x-next-cursor"])
+    assert [comment["content"] for comment in rest] == ["Yorum 2", "Yorum 1", "Yorum 0"]
+
+
+def test_page_size_is_bounded(api, db):
+    path = thread(api, db, 1)
+    assert api.get(path, params={"limit": 0}).status_code == 422
+    assert api.get(path, params={"limit": server.COMMENTS_MAX_PAGE_SIZE + 1}).status_code == 422
+    assert api.get(path, params={"format": "ndjson", "cursor": "bozuk"}).status_code == 400
@@ -0,0 +1,128 @@
+import gzip
+
+import brotli
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from compression import CompressionMiddleware, choose_encoding
+from server import is_not_modified
+
+BIG_BODY = "oyun incelemesi " * 200
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("br, gzip", "br"),
+    ("gzip, deflate", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0.5, br;q=0.1", "br"),
+    ("*", "br"),
+    ("identity", None),
+    ("br;q=0, gzip;q=0", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+async def events():
+    yield "event: token\ndata: {}\n\n" * 100
+
+
+async def chunks():
+    for _ in range(3):
+        yield BIG_BODY.encode()
+
+
+def make_client():
+    app = Starlette(routes=[
+        Route("/big", lambda request: PlainTextResponse(BIG_BODY, headers={"ETag": '"abc"'})),
+        Route("/small", lambda request: PlainTextResponse("kısa")),
+        Route("/stream", lambda request: StreamingResponse(chunks(), media_type="text/plain")),
+        Route("/events", lambda request: StreamingResponse(events(), media_type="text/event-stream")),
+        Route("/not-modified", lambda request: Response(status_code=304, headers={"ETag": '"abc"'})),
+        Route("/encoded", lambda request: Response(gzip.compress(BIG_BODY.encode()), headers={"Content-Encoding": "gzip"})),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+def raw_get(client, path, accept_encoding):
+    # Read the body undecoded so the test sees what went over the wire
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_large_bodies_are_compressed_with_the_preferred_encoding():
+    client = make_client()
+    response, body = raw_get(client, "/big", "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) == len(body)
+    assert brotli.decompress(body).decode() == BIG_BODY
+
+    response, body = raw_get(client, "/big", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == BIG_BODY
+
+
+def test_streamed_bodies_are_compressed_chunk_by_chunk():
+    response, body = raw_get(make_client(), "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body).decode() == BIG_BODY * 3
+
+
+def test_identity_clients_get_the_plain_body():
+    response, body = raw_get(make_client(), "/big", "identity")
+    assert "content-encoding" not in response.headers
+    assert body.decode() == BIG_BODY
+
+
+def test_bodies_under_the_threshold_are_not_compressed():
+    response, body = raw_get(make_client(), "/small", "br")
+    assert "content-encoding" not in response.headers
+    assert body.decode() == "kısa"
+
+
+def test_event_streams_are_not_compressed():
+    response, body = raw_get(make_client(), "/events", "br")
+    assert "content-encoding" not in response.headers
+    assert body.startswith(b"event: token")
+
+
+def test_compressed_variants_get_a_weak_etag():
+    client = make_client()
+    response, _ = raw_get(client, "/big", "br")
+    assert response.headers["etag"] == 'W/"abc"'
+
+    response, _ = raw_get(client, "/big", "identity")
+    assert response.headers["etag"] == '"abc"'
+
+
+def test_not_modified_responses_pass_through():
+    response, body = raw_get(make_client(), "/not-modified", "br")
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+    assert body == b""
+    # Same validator and Vary as the compressed 200 it revalidates
+    assert response.headers["etag"] == 'W/"abc"'
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+def test_already_encoded_bodies_pass_through():
+    response, body = raw_get(make_client(), "/encoded", "br")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == BIG_BODY
+
+
+def test_conditional_get_matches_weak_and_strong_validators():
+    def request(if_none_match):
+        return Request({"type": "http", "headers": [(b"if-none-match", if_none_match.encode())]})
+
+    assert is_not_modified(request('W/"abc"'), '"abc"')
+    assert is_not_modified(request('"xyz", "abc"'), '"abc"')
+    assert not is_not_modified(request('W/"xyz"'), '"abc"')
@@ -0,0 +1,54 @@
+def create_review(api, headers):
+    response = api.post("/api/reviews", headers=headers, json={
+        "title": "Başlık", "content": "İçerik metni.", "game_name": "Hades", "category": "RPG"
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def revalidate(api, path, etag):
+    return api.get(path, headers={"If-None-Match": etag})
+
+
+def test_profile_is_private_and_revalidates(api, signup):
+    user, headers = signup()
+    path = f"/api/users/{user['id']}"
+    first = api.get(path)
+    assert first.headers["cache-control"] == "private, max-age=60, must-revalidate"
+    assert "last-modified" not in first.headers
+
+    not_modified = revalidate(api, path, first.headers["etag"])
+    assert not_modified.status_code == 304
+    assert not_modified.headers["cache-control"].startswith("private")
+
+    api.put("/api/users/me", headers=headers, json={"bio": "Yeni biyografi"})
+    assert revalidate(api, path, first.headers["etag"]).status_code == 200
+
+
+def test_review_etag_moves_on_likes(api, signup):
+    _, headers = signup()
+    review = create_review(api, headers)
+    path = f"/api/reviews/{review['id']}"
+    etag = api.get(path).headers["etag"]
+    assert revalidate(api, path, etag).status_code == 304
+    assert revalidate(api, path, f"W/{etag}").status_code == 304
+
+    api.post(f"{path}/like", headers=headers)
+    assert revalidate(api, path, etag).status_code == 200
+
+
+def test_user_reviews_etag_moves_on_comments(api, signup):
+    user, headers = signup()
+    review = create_review(api, headers)
+    path = f"/api/users/{user['id']}/reviews"
+    etag = api.get(path).headers["etag"]
+    assert revalidate(api, path, etag).status_code == 304
+
+    api.post(f"/api/reviews/{review['id']}/comments", headers=headers, json={"content": "Yorum."})
+    assert revalidate(api, path, etag).status_code == 200
+
+
+def test_if_modified_since_alone_never_yields_304(api, signup):
+    user, _ = signup()
+    response = api.get(f"/api/users/{user['id']}", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert response.status_code == 200
@@ -0,0 +1,35 @@
+import pytest
+from pymongo.read_preferences import Nearest, Primary, SecondaryPreferred
+
+from db_settings import available_compressors, client_options, read_preference
+
+
+def test_only_settings_that_are_present_are_passed():
+    assert client_options({}) == {"tz_aware": True}
+    assert client_options({"MONGO_MAX_POOL_SIZE": "200", "MONGO_MIN_POOL_SIZE": ""}) == {
+        "tz_aware": True, "maxPoolSize": 200
+    }
+
+
+def test_compressors_are_opt_in_and_filtered_to_known_ones():
+    assert "compressors" not in client_options({"MONGO_COMPRESSORS": ""})
+    assert available_compressors("ZLIB, lz4, zlib") == ["zlib"]
+    assert client_options({"MONGO_COMPRESSORS": "zlib"})["compressors"] == ["zlib"]
+
+
+def test_compressors_without_their_package_are_skipped(monkeypatch):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    assert available_compressors("zstd,snappy,zlib") == ["zlib"]
+
+
+def test_read_preference_modes():
+    assert read_preference("primary", 120) == Primary()
+    assert read_preference("secondaryPreferred") == SecondaryPreferred()
+    assert read_preference("nearest", -1) == Nearest()
+    assert read_preference("nearest", 90).max_staleness == 90
+
+
+@pytest.mark.parametrize("mode, staleness", [("secondary", 30), ("leader", None)])
+def test_invalid_read_preferences_are_rejected(mode, staleness):
+    with pytest.raises(ValueError):
+        read_preference(mode, staleness)
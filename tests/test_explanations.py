@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+import server
+from cache import ResponseCache
+from server import explanation_key
+
+pytestmark = pytest.mark.anyio
+
+
+def test_key_ignores_case_diacritics_and_spacing_but_not_context():
+    assert explanation_key("  NERF ", "Silaha nerf geldi.") == explanation_key("nerf", "Silaha nerf geldi.")
+    assert explanation_key("İyileştirme", "bağlam") == explanation_key("iyilestirme", "bağlam")
+    assert explanation_key("nerf", "Silaha nerf geldi.") != explanation_key("nerf", "Karaktere nerf geldi.")
+
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    calls = []
+
+    async def generate(word, context, client):
+        calls.append(word)
+        await asyncio.sleep(0.01)
+        return f"{word}: açıklama"
+
+    monkeypatch.setattr(server, "generate_explanation", generate)
+    return calls
+
+
+async def test_concurrent_requests_share_one_model_call(db, model_calls):
+    results = await asyncio.gather(*[
+        server.get_explanation("nerf", "Silaha nerf geldi.", f"10.0.0.{n}", "review-1") for n in range(5)
+    ])
+    assert results == ["nerf: açıklama"] * 5
+    assert model_calls == ["nerf"]
+
+    stored = await db.explanations.find_one({"_id": explanation_key("nerf", "Silaha nerf geldi.")})
+    assert stored["explanation"] == "nerf: açıklama"
+    assert stored["review_id"] == "review-1"
+
+
+async def test_other_workers_read_the_stored_explanation(db, model_calls, monkeypatch):
+    await server.get_explanation("nerf", "Silaha nerf geldi.", "10.0.0.1")
+    # A fresh in-process cache stands in for another worker
+    monkeypatch.setattr(server, "explain_cache", ResponseCache())
+    assert await server.get_explanation("nerf", "Silaha nerf geldi.", "10.0.0.2") == "nerf: açıklama"
+    assert model_calls == ["nerf"]
+
+
+async def test_invalidation_drops_only_that_reviews_explanations(db, model_calls):
+    await server.get_explanation("nerf", "Birinci bağlam.", "10.0.0.1", "review-1")
+    await server.get_explanation("buff", "İkinci bağlam.", "10.0.0.1", "review-2")
+
+    await server.invalidate_explanations("review-1")
+    assert [doc["review_id"] async for doc in db.explanations.find({})] == ["review-2"]
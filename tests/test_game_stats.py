@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_first_worker_holds_the_lease_until_it_expires(db, monkeypatch):
+    monkeypatch.setattr(server, "WORKER_ID", "web-1:10")
+    assert await server.acquire_lease("rebuild", 60)
+    # The holder renews its own lease
+    assert await server.acquire_lease("rebuild", 60)
+
+    monkeypatch.setattr(server, "WORKER_ID", "web-2:20")
+    assert not await server.acquire_lease("rebuild", 60)
+
+    await db.leases.update_one(
+        {"_id": "rebuild"}, {"$set": {"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}}
+    )
+    assert await server.acquire_lease("rebuild", 60)
+    assert (await db.leases.find_one({"_id": "rebuild"}))["holder"] == "web-2:20"
+
+
+async def test_only_the_lease_holder_rebuilds(db, monkeypatch):
+    rebuilds = []
+
+    async def rebuild():
+        rebuilds.append(server.WORKER_ID)
+
+    monkeypatch.setattr(server, "rebuild_game_stats", rebuild)
+
+    async def worker(worker_id):
+        monkeypatch.setattr(server, "WORKER_ID", worker_id)
+        await server.game_stats_rebuild_loop()
+
+    # Workers share module state here, so give each one a single pass in turn
+    for worker_id in ("web-1:10", "web-2:20", "web-1:10"):
+        loop = asyncio.create_task(worker(worker_id))
+        await asyncio.sleep(0.01)
+        loop.cancel()
+
+    assert rebuilds == ["web-1:10", "web-1:10"]
+
+
+async def test_update_game_stats_applies_deltas_and_rescores(db):
+    review = {"rating": 8, "likes_count": 0}
+    await server.update_game_stats("Hades", server.game_stats_delta(review), cover_image="kapak.png")
+    await server.update_game_stats("Hades", server.game_stats_delta({"rating": None}), cover_image="baska.png")
+    await server.update_game_stats("Hades", {"total_likes": 3})
+
+    stats = await db.game_stats.find_one({"_id": "Hades"})
+    assert stats["review_count"] == 2
+    assert stats["rating_sum"] == 8
+    assert stats["rating_count"] == 1
+    assert stats["cover_image"] == "kapak.png"
+    assert stats["popularity_score"] == 2 * 10 + 3 * 5 + 8 * 2
+
+
+async def test_removing_the_last_review_drops_the_game(db):
+    review = {"rating": 7, "likes_count": 2}
+    await server.update_game_stats("Hades", server.game_stats_delta(review))
+    await server.update_game_stats("Hades", server.game_stats_delta(review, -1))
+    assert await db.game_stats.find_one({"_id": "Hades"}) is None
@@ -0,0 +1,49 @@
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+import server
+
+
+@pytest.mark.anyio
+async def test_ensure_indexes_creates_every_declared_index(db):
+    await server.ensure_indexes()
+    for collection_name, indexes in server.INDEXES.items():
+        existing = await db[collection_name].index_information()
+        declared = [keys for keys, _ in indexes]
+        assert all(list(info["key"]) in declared for name, info in existing.items() if name != "_id_")
+        assert len(existing) == len(indexes) + 1
+
+
+@pytest.mark.anyio
+async def test_ensure_indexes_survives_existing_duplicates(db):
+    await db.users.insert_many([
+        {"id": "a", "email": "ayni@example.com", "username": "a"},
+        {"id": "b", "email": "ayni@example.com", "username": "b"},
+    ])
+    await server.ensure_indexes()
+
+    existing = await db.users.index_information()
+    assert "username_1" in existing
+    assert "email_1" not in existing
+
+
+def test_duplicate_username_on_register_is_rejected(api, signup):
+    signup("yazar")
+    response = api.post("/api/auth/register", json={
+        "email": "baska@example.com", "username": "yazar", "password": "gizli-parola"
+    })
+    assert response.status_code == 400
+
+
+def test_concurrent_rename_to_a_taken_name_gets_400(api, signup, hook):
+    signup("ilk")
+    _, headers = signup("ikinci")
+
+    async def rename_race(query, update, **kwargs):
+        # The unique index rejects the write after the pre-check passed
+        raise DuplicateKeyError("E11000 duplicate key error collection: users index: username_1")
+
+    hook("users", "update_one", rename_race)
+    response = api.put("/api/users/me", json={"username": "ortak"}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already taken"
@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction):
+        self.docs = sorted(self.docs, key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    async def to_list(self, length):
+        return [dict(doc) for doc in self.docs[:length]]
+
+
+class FakeJobs:
+    """The find/update_one subset of a Motor collection that job_loop uses."""
+
+    def __init__(self, ids):
+        now = datetime.now(timezone.utc)
+        self.docs = {
+            job_id: {"_id": job_id, "status": "pending", "created_at": now + timedelta(seconds=position)}
+            for position, job_id in enumerate(ids)
+        }
+
+    def find(self, query):
+        excluded = query.get("_id", {}).get("$nin", [])
+        return FakeCursor([
+            doc for doc in self.docs.values() if doc["status"] == query["status"] and doc["_id"] not in excluded
+        ])
+
+    async def update_one(self, query, update):
+        doc = self.docs[query["_id"]]
+        for field, value in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + value
+        doc.update(update.get("$set", {}))
+
+
+async def test_failing_job_does_not_block_the_jobs_behind_it(monkeypatch):
+    monkeypatch.setattr(server, "JOB_POLL_SECONDS", 0.01)
+    jobs = FakeJobs(["broken", "first", "second"])
+    finished = []
+
+    async def run_job(job):
+        if job["_id"] == "broken":
+            raise RuntimeError("upstream went away")
+        jobs.docs[job["_id"]]["status"] = "done"
+        finished.append(job["_id"])
+
+    loop = asyncio.create_task(server.job_loop(jobs, run_job, asyncio.Event(), "Test jobs"))
+    try:
+        for _ in range(100):
+            if jobs.docs["broken"].get("attempts", 0) >= 2:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        loop.cancel()
+
+    assert finished == ["first", "second"]
+    # Retried on later passes, once per pass
+    broken = jobs.docs["broken"]
+    assert broken["status"] == "pending"
+    assert broken["attempts"] >= 2
+    assert broken["last_error"] == "upstream went away"
@@ -0,0 +1,43 @@
+import json
+from datetime import datetime, timezone
+
+from fastapi import Response
+
+import server
+from server import dump_json, json_body
+
+
+def test_dump_json_writes_utc_timestamps_and_raw_utf8():
+    body = dump_json({
+        "aware": datetime(2026, 5, 1, 12, 30, tzinfo=timezone.utc),
+        "naive": datetime(2026, 5, 1, 12, 30),
+        "title": "Çılgın Yarış",
+    })
+    assert json.loads(body) == {"aware": "2026-05-01T12:30:00Z", "naive": "2026-05-01T12:30:00Z", "title": "Çılgın Yarış"}
+    assert "Çılgın".encode() in body
+
+
+def test_json_body_keeps_headers_set_on_the_injected_response():
+    injected = Response()
+    injected.headers["X-Next-Cursor"] = "abc"
+    injected.headers["ETag"] = '"etag"'
+
+    response = json_body(b'[1,2]', injected)
+    assert response.body == b'[1,2]'
+    assert response.media_type == "application/json"
+    assert response.headers["x-next-cursor"] == "abc"
+    assert response.headers["etag"] == '"etag"'
+    assert response.headers["content-length"] == "5"
+
+
+def test_feed_rows_match_the_declared_models(api, signup):
+    _, headers = signup()
+    api.post("/api/reviews", headers=headers, json={
+        "title": "Başlık", "content": "İçerik metni.", "game_name": "Hades", "category": "RPG", "rating": 9
+    })
+
+    summary = api.get("/api/reviews").json()[0]
+    assert server.ReviewSummary.model_validate(summary).model_dump(mode="json").keys() == summary.keys()
+    full = api.get("/api/reviews", params={"fields": "full"}).json()[0]
+    assert server.Review.model_validate(full).content == "İçerik metni."
+    assert summary["created_at"].endswith("Z")
@@ -0,0 +1,37 @@
+import server
+
+
+def create_review(api, headers, title):
+    response = api.post("/api/reviews", headers=headers, json={
+        "title": title, "content": "İçerik metni.", "game_name": "Hades", "category": "RPG"
+    })
+    return response.json()["id"]
+
+
+def test_status_lists_liked_ids_in_request_order(api, signup):
+    _, headers = signup()
+    first, second, third = (create_review(api, headers, title) for title in ("Bir", "İki", "Üç"))
+    for review_id in (third, first):
+        api.post(f"/api/reviews/{review_id}/like", headers=headers)
+
+    response = api.post("/api/likes/status", headers=headers, json={
+        "review_ids": [first, second, third, first, "olmayan"]
+    })
+    assert response.json() == {"liked": [first, third]}
+
+
+def test_status_only_reports_the_callers_likes(api, signup):
+    _, author = signup("yazar")
+    _, reader = signup("okur")
+    review_id = create_review(api, author, "Bir")
+    api.post(f"/api/reviews/{review_id}/like", headers=author)
+
+    assert api.post("/api/likes/status", headers=reader, json={"review_ids": [review_id]}).json() == {"liked": []}
+
+
+def test_status_validates_the_request(api, signup):
+    _, headers = signup()
+    assert api.post("/api/likes/status", headers=headers, json={"review_ids": []}).json() == {"liked": []}
+    too_many = [f"r{n}" for n in range(server.LIKE_STATUS_MAX_IDS + 1)]
+    assert api.post("/api/likes/status", headers=headers, json={"review_ids": too_many}).status_code == 422
+    assert api.post("/api/likes/status", json={"review_ids": ["r1"]}).status_code == 401
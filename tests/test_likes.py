@@ -0,0 +1,69 @@
+import asyncio
+
+from pymongo.errors import DuplicateKeyError
+
+
+def create_review(api, headers):
+    response = api.post("/api/reviews", headers=headers, json={
+        "title": "Başlık", "content": "İçerik metni.", "game_name": "Hades", "category": "RPG"
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def like_state(db, review_id):
+    likes = asyncio.run(db.likes.count_documents({"review_id": review_id}))
+    review = asyncio.run(db.reviews.find_one({"id": review_id}))
+    stats = asyncio.run(db.game_stats.find_one({"_id": review["game_name"]}))
+    return likes, review["likes_count"], stats["total_likes"]
+
+
+def test_toggle_moves_the_like_and_both_counters(api, db, signup):
+    _, headers = signup()
+    review = create_review(api, headers)
+    path = f"/api/reviews/{review['id']}/like"
+
+    assert api.post(path, headers=headers).json()["liked"] is True
+    assert like_state(db, review["id"]) == (1, 1, 1)
+    assert api.get(f"/api/reviews/{review['id']}/liked", headers=headers).json() == {"liked": True}
+
+    assert api.post(path, headers=headers).json()["liked"] is False
+    assert like_state(db, review["id"]) == (0, 0, 0)
+
+
+def test_losing_the_upsert_race_keeps_counters_in_step(api, db, signup, hook):
+    _, headers = signup()
+    review = create_review(api, headers)
+
+    async def concurrent_like(query, update, **kwargs):
+        # A concurrent click created the like and counted it first
+        await db.likes.insert_one(dict(update["$setOnInsert"]))
+        await db.reviews.update_one({"id": review["id"]}, {"$inc": {"likes_count": 1}})
+        await db.game_stats.update_one({"_id": "Hades"}, {"$inc": {"total_likes": 1}})
+        raise DuplicateKeyError("E11000 duplicate key error collection: likes index: review_id_1_user_id_1")
+
+    hook("likes", "update_one", concurrent_like)
+    # The request is treated as the second click of a double click
+    assert api.post(f"/api/reviews/{review['id']}/like", headers=headers).json()["liked"] is False
+    assert like_state(db, review["id"]) == (0, 0, 0)
+
+
+def test_unlike_that_finds_nothing_to_remove_changes_nothing(api, db, signup, hook):
+    _, headers = signup()
+    review = create_review(api, headers)
+    api.post(f"/api/reviews/{review['id']}/like", headers=headers)
+
+    async def concurrent_unlike(query, **kwargs):
+        await db.likes.delete_one(query)
+        await db.reviews.update_one({"id": review["id"]}, {"$inc": {"likes_count": -1}})
+        await db.game_stats.update_one({"_id": "Hades"}, {"$inc": {"total_likes": -1}})
+
+    hook("likes", "delete_one", concurrent_unlike)
+    assert api.post(f"/api/reviews/{review['id']}/like", headers=headers).json()["liked"] is False
+    assert like_state(db, review["id"]) == (0, 0, 0)
+
+
+def test_liking_a_missing_review_leaves_no_like_behind(api, db, signup):
+    _, headers = signup()
+    assert api.post("/api/reviews/olmayan/like", headers=headers).status_code == 404
+    assert asyncio.run(db.likes.count_documents({})) == 0
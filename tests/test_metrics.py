@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from metrics import UNMATCHED_ROUTE, MongoCommandMetrics
+
+
+def requests_total(method, route, status):
+    return REGISTRY.get_sample_value(
+        "http_requests_total", {"method": method, "route": route, "status": status}
+    ) or 0
+
+
+def test_requests_are_labelled_by_route_template(api):
+    before = requests_total("GET", "/api/reviews/{review_id}", "404")
+    api.get("/api/reviews/olmayan-1")
+    api.get("/api/reviews/olmayan-2")
+    assert requests_total("GET", "/api/reviews/{review_id}", "404") == before + 2
+
+
+def test_unknown_paths_share_one_label(api):
+    before = requests_total("GET", UNMATCHED_ROUTE, "404")
+    api.get("/api/boyle-bir-yol-yok/123")
+    api.get("/favicon.ico")
+    assert requests_total("GET", UNMATCHED_ROUTE, "404") == before + 2
+
+
+def test_metrics_endpoint_serves_the_exposition_format(api):
+    api.get("/api/reviews/olmayan")
+    response = api.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/reviews/{review_id}"' in response.text
+    assert "http_request_duration_seconds_bucket" in response.text
+
+
+def command_event(name, command, request_id, duration_micros=1500):
+    return SimpleNamespace(
+        command_name=name, command=command, connection_id=("localhost", 27017),
+        request_id=request_id, duration_micros=duration_micros
+    )
+
+
+def command_count(command, collection, outcome):
+    return REGISTRY.get_sample_value(
+        "mongodb_command_duration_seconds_count", {"command": command, "collection": collection, "outcome": outcome}
+    ) or 0
+
+
+def test_mongo_commands_are_timed_per_collection():
+    listener = MongoCommandMetrics()
+    before = (command_count("find", "reviews", "ok"), command_count("getMore", "reviews", "error"))
+
+    listener.started(command_event("find", {"find": "reviews", "filter": {}}, 1))
+    listener.succeeded(command_event("find", {}, 1))
+    listener.started(command_event("getMore", {"getMore": 123, "collection": "reviews"}, 2))
+    listener.failed(command_event("getMore", {}, 2))
+
+    assert command_count("find", "reviews", "ok") == before[0] + 1
+    assert command_count("getMore", "reviews", "error") == before[1] + 1
+    assert listener.pending == {}
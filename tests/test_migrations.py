@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import server
+from server import EXCERPT_LENGTH, make_excerpt
+
+pytestmark = pytest.mark.anyio
+
+
+def test_short_content_is_its_own_excerpt():
+    assert make_excerpt("  Kısa   bir\nmetin. ") == "Kısa bir metin."
+
+
+def test_long_content_is_cut_at_a_word_boundary():
+    excerpt = make_excerpt("kelime " * 100)
+    assert excerpt.endswith("kelime…")
+    assert len(excerpt) <= EXCERPT_LENGTH + 1
+    assert make_excerpt("a" * 1000) == "a" * EXCERPT_LENGTH + "…"
+
+
+async def test_migrations_run_until_one_completes(db):
+    runs = []
+
+    async def failing():
+        runs.append("failing")
+        raise RuntimeError("interrupted")
+
+    async def succeeding():
+        runs.append("succeeding")
+
+    with pytest.raises(RuntimeError):
+        await server.run_migration("excerpts", failing)
+    await server.run_migration("excerpts", succeeding)
+    await server.run_migration("excerpts", succeeding)
+
+    assert runs == ["failing", "succeeding"]
+    assert (await db.migrations.find_one({"_id": "excerpts"}))["finished_at"]
+
+
+async def test_backfill_fills_missing_excerpts_only(db):
+    await db.reviews.insert_many([
+        {"id": "eski", "content": "Eski inceleme metni."},
+        {"id": "yeni", "content": "Yeni metin.", "excerpt": "Elle yazılmış özet."},
+    ])
+    await server.run_migration("excerpts", server.backfill_excerpts)
+    excerpts = {doc["id"]: doc["excerpt"] async for doc in db.reviews.find({})}
+    assert excerpts == {"eski": "Eski inceleme metni.", "yeni": "Elle yazılmış özet."}
+
+
+async def test_string_timestamps_become_dates(db):
+    await db.comments.insert_one({"id": "c1", "created_at": "2026-02-03T04:05:06+00:00"})
+    await server.run_migration("timestamps", server.migrate_timestamps)
+    comment = await db.comments.find_one({"id": "c1"})
+    assert comment["created_at"] == datetime(2026, 2, 3, 4, 5, 6, tzinfo=timezone.utc)
+
+
+def test_list_routes_document_both_field_sets(api, signup):
+    schema = api.get("/openapi.json").json()
+    response = schema["paths"]["/api/reviews"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {option["items"]["$ref"].rsplit("/", 1)[-1] for option in response["anyOf"]} == {"ReviewSummary", "Review"}
+
+    _, headers = signup()
+    api.post("/api/reviews", headers=headers, json={
+        "title": "Başlık", "content": "İçerik metni.", "game_name": "Hades", "category": "RPG"
+    })
+    assert "content" not in api.get("/api/reviews").json()[0]
+    assert api.get("/api/reviews", params={"fields": "full"}).json()[0]["content"] == "İçerik metni."
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+import server
+from server import decode_cursor, encode_cursor
+
+
+def make_review(n, created_at):
+    return {
+        "id": f"review-{n:02d}", "title": f"İnceleme {n}", "content": "Uzun bir metin.", "excerpt": "Uzun bir metin.",
+        "game_name": "Hades", "category": "RPG", "tags": [], "rating": 8, "cover_image": None,
+        "author_id": "user-1", "author_username": "yazar", "likes_count": 0, "comments_count": 0,
+        "version": 0, "created_at": created_at, "updated_at": created_at,
+    }
+
+
+@pytest.fixture
+def reviews(db):
+    # Two pairs share a timestamp so the id tiebreak is exercised
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    docs = [make_review(n, start + timedelta(minutes=n // 2)) for n in range(7)]
+    asyncio.run(db.reviews.insert_many([dict(doc) for doc in docs]))
+    # Newest first, ids descending within a timestamp
+    return sorted(docs, key=lambda doc: (doc["created_at"], doc["id"]), reverse=True)
+
+
+def test_cursor_round_trip_points_past_the_document():
+    created_at = datetime(2026, 3, 4, 5, 6, 7, 890000, tzinfo=timezone.utc)
+    query = decode_cursor(encode_cursor({"created_at": created_at, "id": "abc"}))
+    assert query == {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "id": {"$lt": "abc"}},
+    ]}
+
+
+@pytest.mark.parametrize("cursor", ["bozuk", "W10=", "WyJkdW4iLCAiYWJjIl0=", "!!!"])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_invalid_cursor_is_a_400(api, reviews):
+    assert api.get("/api/reviews", params={"cursor": "bozuk"}).status_code == 400
+    assert api.get("/api/users/user-1/reviews", params={"cursor": "bozuk"}).status_code == 400
+    assert api.get("/api/reviews/review-00/comments", params={"cursor": "bozuk"}).status_code == 400
+
+
+def walk(api, path):
+    seen, cursor = [], None
+    while True:
+        response = api.get(path, params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        seen.extend(review["id"] for review in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return seen
+
+
+@pytest.mark.parametrize("path", ["/api/reviews", "/api/users/user-1/reviews"])
+def test_keyset_pages_cover_the_feed_once_in_order(api, reviews, path):
+    assert walk(api, path) == [review["id"] for review in reviews]
+
+
+def test_cursor_pages_ignore_inserts_at_the_head(api, db, reviews):
+    first = api.get("/api/reviews", params={"limit": 3})
+    asyncio.run(db.reviews.insert_one(make_review(99, datetime(2027, 1, 1, tzinfo=timezone.utc))))
+    second = api.get("/api/reviews", params={"limit": 3, "cursor": first.headers["x-next-cursor"]})
+    assert [review["id"] for review in second.json()] == [review["id"] for review in reviews[3:6]]
+
+
+def test_search_cursor_is_an_offset_into_the_ranking(api, reviews):
+    for review in reviews:
+        server.index_review(review)
+    first = api.get("/api/search", params={"q": "hades", "limit": 4}).json()
+    assert len(first["reviews"]) == 4
+    second = api.get("/api/search", params={"q": "hades", "limit": 4, "cursor": first["next_cursor"]}).json()
+    assert second["next_cursor"] is None
+    ids = [review["id"] for review in first["reviews"] + second["reviews"]]
+    assert sorted(ids) == sorted(review["id"] for review in reviews)
+    assert api.get("/api/search", params={"q": "hades", "cursor": "bozuk"}).status_code == 400
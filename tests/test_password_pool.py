@@ -0,0 +1,50 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+import server
+
+
+@pytest.mark.anyio
+async def test_hashing_runs_on_the_password_pool():
+    thread_name = await server.run_password_job(lambda: threading.current_thread().name)
+    assert thread_name.startswith("password-hash")
+    assert server.password_jobs == 0
+
+
+@pytest.mark.anyio
+async def test_requests_over_the_queue_limit_get_429(monkeypatch):
+    monkeypatch.setattr(server, "PASSWORD_HASH_QUEUE_LIMIT", 2)
+    release = threading.Event()
+    held = [asyncio.create_task(server.run_password_job(release.wait, 5)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(HTTPException) as error:
+        await server.run_password_job(lambda: None)
+    assert error.value.status_code == 429
+    assert error.value.headers["Retry-After"] == "1"
+
+    release.set()
+    await asyncio.gather(*held)
+    # Slots are released whether the job succeeded or not
+    assert server.password_jobs == 0
+    assert await server.run_password_job(lambda: "ok") == "ok"
+
+
+def test_login_rehashes_passwords_below_the_configured_rounds(api, db, signup, monkeypatch):
+    user, _ = signup()
+    weak = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("gizli-parola")
+    asyncio.run(db.users.update_one({"id": user["id"]}, {"$set": {"password": weak}}))
+    monkeypatch.setattr(server, "pwd_context", CryptContext(
+        schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=5, bcrypt__min_rounds=5
+    ))
+
+    response = api.post("/api/auth/login", json={"email": user["email"], "password": "gizli-parola"})
+    assert response.status_code == 200
+    stored = asyncio.run(db.users.find_one({"id": user["id"]}))["password"]
+    assert stored != weak
+    assert stored.startswith("$2b$05$")
+    assert api.post("/api/auth/login", json={"email": user["email"], "password": "yanlis"}).status_code == 401
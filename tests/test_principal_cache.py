@@ -0,0 +1,35 @@
+import server
+
+
+def count_lookups(hook):
+    lookups = []
+
+    async def record(query, *args, **kwargs):
+        lookups.append(query)
+
+    hook("users", "find_one", record)
+    return lookups
+
+
+def test_authenticated_requests_share_one_user_lookup(api, signup, hook):
+    user, headers = signup()
+    lookups = count_lookups(hook)
+    for _ in range(3):
+        assert api.get("/api/auth/me", headers=headers).json()["id"] == user["id"]
+    assert lookups == [{"id": user["id"]}]
+
+
+def test_profile_update_refreshes_the_cached_principal(api, signup):
+    _, headers = signup()
+    assert api.get("/api/auth/me", headers=headers).json()["username"] == "yazar"
+
+    assert api.put("/api/users/me", headers=headers, json={"username": "yeni_ad"}).status_code == 200
+    assert api.get("/api/auth/me", headers=headers).json()["username"] == "yeni_ad"
+
+
+def test_unknown_or_invalid_tokens_are_rejected(api):
+    token = server.create_access_token({"sub": "olmayan-kullanici"})
+    assert api.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+    assert api.get("/api/auth/me", headers={"Authorization": "Bearer bozuk"}).status_code == 401
+    # The failed lookup is not cached as a principal
+    assert "olmayan-kullanici" not in server.principal_cache.entries
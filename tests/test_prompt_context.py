@@ -0,0 +1,65 @@
+from prompt_context import (
+    CHARS_PER_TOKEN,
+    OMITTED,
+    estimate_tokens,
+    find_term,
+    relevant_section,
+    window_around,
+)
+
+FILLER = "Bu cümle yalnızca metni uzatmak için burada. "
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a" * (CHARS_PER_TOKEN + 1)) == 2
+
+
+def test_find_term_ignores_case_and_diacritics():
+    text = "Oyunun en iyi yanı İLERLEME sistemi."
+    assert find_term(text, "ilerleme") == text.index("İLERLEME")
+    assert find_term(text, "yoktur") == -1
+    assert find_term(text, "  ") == -1
+
+
+def test_window_around_returns_short_text_unchanged():
+    assert window_around("Kısa metin.", 0, 100) == "Kısa metin."
+
+
+def test_window_around_centers_on_the_offset():
+    text = FILLER * 20 + "Nerf bu sürümde çok sert geldi. " + FILLER * 20
+    window = window_around(text, text.index("Nerf"), 40)
+    assert "Nerf bu sürümde" in window
+    assert len(window) <= 40 * CHARS_PER_TOKEN
+
+
+def test_window_around_tells_repeated_words_apart():
+    text = "İlk nerf burada. " + FILLER * 20 + "İkinci nerf sonda."
+    assert window_around(text, text.rindex("nerf"), 10).endswith("İkinci nerf sonda.")
+    assert window_around(text, text.index("nerf"), 10).startswith("İlk nerf burada.")
+
+
+def test_window_around_cuts_a_single_long_sentence():
+    text = "kelime " * 500 + "hedef " + "kelime " * 500
+    window = window_around(text, text.index("hedef"), 20)
+    assert "hedef" in window
+    assert len(window) <= 20 * CHARS_PER_TOKEN
+
+
+def test_relevant_section_returns_short_drafts_unchanged():
+    assert relevant_section("Taslak.", "istek", 100) == "Taslak."
+
+
+def test_relevant_section_keeps_the_matching_paragraph():
+    paragraphs = [FILLER * 5, "Grafikler ve sanat yönetimi etkileyici. " * 3, FILLER * 5, FILLER * 5]
+    section = relevant_section("\n\n".join(paragraphs), "grafikler hakkında yaz", 100)
+    assert "Grafikler ve sanat" in section
+    assert OMITTED in section
+    assert len(section) <= 100 * CHARS_PER_TOKEN + 2 * len(OMITTED) + 8
+
+
+def test_relevant_section_without_overlap_keeps_the_end():
+    paragraphs = [FILLER * 5 for _ in range(6)] + ["Son paragraf burada."]
+    section = relevant_section("\n\n".join(paragraphs), "alakasız", 60)
+    assert section.endswith("Son paragraf burada.")
+    assert section.startswith(OMITTED)
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(server, "REAPER_BATCH_SIZE", 2)
+    monkeypatch.setattr(server, "REAPER_PAUSE_SECONDS", 0)
+
+
+def review_with_children(api, signup, comments=3):
+    _, headers = signup()
+    review = api.post("/api/reviews", headers=headers, json={
+        "title": "Silinecek", "content": "İçerik metni.", "game_name": "Hades", "category": "RPG", "rating": 7
+    }).json()
+    for n in range(comments):
+        api.post(f"/api/reviews/{review['id']}/comments", headers=headers, json={"content": f"Yorum {n}"})
+    api.post(f"/api/reviews/{review['id']}/like", headers=headers)
+    return review, headers
+
+
+def test_delete_answers_before_the_reaper_runs(api, db, signup):
+    review, headers = review_with_children(api, signup)
+    assert api.delete(f"/api/reviews/{review['id']}", headers=headers).status_code == 200
+
+    assert api.get(f"/api/reviews/{review['id']}").status_code == 404
+    assert api.get("/api/reviews/count").json()["count"] == 0
+    assert server.review_index.search("silinecek") == []
+    job = asyncio.run(db.review_deletions.find_one({"_id": review["id"]}))
+    assert job["status"] == "pending"
+    assert job["review"]["title"] == "Silinecek"
+    assert asyncio.run(db.comments.count_documents({"review_id": review["id"]})) == 3
+
+    asyncio.run(server.reap_review(job))
+    job = asyncio.run(db.review_deletions.find_one({"_id": review["id"]}))
+    assert (job["status"], job["comments_deleted"], job["likes_deleted"]) == ("done", 3, 1)
+    assert asyncio.run(db.comments.count_documents({})) == 0
+    assert asyncio.run(db.likes.count_documents({})) == 0
+
+
+def test_reaper_finishes_a_delete_interrupted_before_the_review_went(api, db, signup):
+    review, _ = review_with_children(api, signup, comments=1)
+    # The request died after writing the tombstone: the review is still there
+    snapshot = {k: v for k, v in asyncio.run(db.reviews.find_one({"id": review["id"]})).items() if k != "_id"}
+    asyncio.run(db.review_deletions.insert_one({
+        "_id": review["id"], "review": snapshot, "status": "pending", "comments_deleted": 0, "likes_deleted": 0,
+    }))
+
+    asyncio.run(server.reap_review(asyncio.run(db.review_deletions.find_one({"_id": review["id"]}))))
+    assert asyncio.run(db.reviews.find_one({"id": review["id"]})) is None
+    assert asyncio.run(db.review_counts.find_one({"_id": "RPG"}))["count"] == 0
+    assert asyncio.run(db.game_stats.find_one({"_id": "Hades"})) is None
+    assert server.review_index.search("silinecek") == []
+    job = asyncio.run(db.review_deletions.find_one({"_id": review["id"]}))
+    assert (job["status"], job["comments_deleted"], job["likes_deleted"]) == ("done", 1, 1)
+
+
+def test_rerunning_a_finished_job_changes_nothing(api, db, signup):
+    review, headers = review_with_children(api, signup, comments=1)
+    api.delete(f"/api/reviews/{review['id']}", headers=headers)
+    job = asyncio.run(db.review_deletions.find_one({"_id": review["id"]}))
+    asyncio.run(server.reap_review(job))
+    asyncio.run(server.reap_review(job))
+
+    assert asyncio.run(db.review_counts.find_one({"_id": "RPG"}))["count"] == 0
+    assert asyncio.run(db.review_deletions.find_one({"_id": review["id"]}))["comments_deleted"] == 1
@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(server, "RENAME_BATCH_SIZE", 2)
+    monkeypatch.setattr(server, "RENAME_PAUSE_SECONDS", 0)
+
+
+async def seed_author(db, reviews=5, comments=3, username="eski"):
+    now = datetime.now(timezone.utc)
+    if reviews:
+        await db.reviews.insert_many([
+            {"id": f"review-{n}", "author_id": "user-1", "author_username": username, "title": f"İnceleme {n}",
+             "game_name": "Hades", "created_at": now, "version": 0}
+            for n in range(reviews)
+        ])
+    if comments:
+        await db.comments.insert_many([
+            {"id": f"comment-{n}", "review_id": "review-0", "author_id": "user-1", "author_username": username}
+            for n in range(comments)
+        ])
+
+
+async def names(db):
+    reviews = {doc["author_username"] async for doc in db.reviews.find({"author_id": "user-1"})}
+    comments = {doc["author_username"] async for doc in db.comments.find({"author_id": "user-1"})}
+    return reviews | comments
+
+
+async def job(db):
+    return await db.rename_jobs.find_one({"_id": "user-1"})
+
+
+async def test_first_pass_renames_in_batches_and_schedules_a_sweep(db):
+    await seed_author(db)
+    await server.enqueue_rename("user-1", "yeni")
+    await server.propagate_rename(await job(db))
+
+    assert await names(db) == {"yeni"}
+    assert [doc_id for doc_id, _ in server.review_index.search("yeni")]
+    state = await job(db)
+    assert (state["reviews_updated"], state["comments_updated"]) == (5, 3)
+    assert state["status"] == "pending"
+    assert state["swept"] is True
+    assert state["checkpoints"] == {"reviews": None, "comments": None}
+    assert state["run_after"] > datetime.now(timezone.utc) + timedelta(seconds=server.PRINCIPAL_CACHE_TTL)
+
+
+async def test_sweep_catches_writes_made_under_the_old_name(db):
+    await seed_author(db, reviews=2, comments=0)
+    await server.enqueue_rename("user-1", "yeni")
+    await server.propagate_rename(await job(db))
+
+    # Another worker's cached principal still carried the old name
+    await db.comments.insert_one(
+        {"id": "late", "review_id": "review-0", "author_id": "user-1", "author_username": "eski"}
+    )
+    await server.propagate_rename(await job(db))
+
+    assert await names(db) == {"yeni"}
+    state = await job(db)
+    assert state["status"] == "done"
+    assert state["comments_updated"] == 1
+
+
+async def test_a_newer_rename_supersedes_the_running_job(db, hook):
+    await seed_author(db, comments=0)
+    await server.enqueue_rename("user-1", "ara")
+    renamed_again = []
+
+    async def rename_mid_job(*args, **kwargs):
+        if not renamed_again:
+            renamed_again.append(True)
+            await server.enqueue_rename("user-1", "son")
+
+    hook("reviews", "bulk_write", rename_mid_job)
+    await server.propagate_rename(await job(db))
+
+    state = await job(db)
+    assert (state["username"], state["status"], state["swept"]) == ("son", "pending", False)
+    assert state["checkpoints"]["reviews"] is None
+
+    await server.propagate_rename(state)
+    await server.propagate_rename(await job(db))
+    assert await names(db) == {"son"}
+    assert (await job(db))["status"] == "done"
+
+
+async def test_job_loop_waits_for_run_after(db, monkeypatch):
+    monkeypatch.setattr(server, "JOB_POLL_SECONDS", 0.01)
+    now = datetime.now(timezone.utc)
+    await db.rename_jobs.insert_many([
+        {"_id": "later", "status": "pending", "created_at": now, "run_after": now + timedelta(hours=1)},
+        {"_id": "due", "status": "pending", "created_at": now, "run_after": now - timedelta(seconds=1)},
+        {"_id": "plain", "status": "pending", "created_at": now},
+    ])
+    ran = []
+
+    async def run_job(job):
+        ran.append(job["_id"])
+        await db.rename_jobs.update_one({"_id": job["_id"]}, {"$set": {"status": "done"}})
+
+    loop = asyncio.create_task(server.job_loop(db.rename_jobs, run_job, asyncio.Event(), "Test jobs"))
+    await asyncio.sleep(0.05)
+    loop.cancel()
+    assert sorted(ran) == ["due", "plain"]
+
+
+def test_profile_rename_enqueues_a_job(api, db, signup):
+    user, headers = signup()
+    assert api.put("/api/users/me", headers=headers, json={"username": "yeni_ad"}).status_code == 200
+    state = asyncio.run(db.rename_jobs.find_one({"_id": user["id"]}))
+    assert (state["username"], state["status"], state["swept"]) == ("yeni_ad", "pending", False)
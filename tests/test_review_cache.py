@@ -0,0 +1,56 @@
+import server
+
+
+def create_review(api, headers, title="Başlık"):
+    response = api.post("/api/reviews", headers=headers, json={
+        "title": title, "content": "İçerik metni.", "game_name": "Hades", "category": "RPG", "rating": 9
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def cached_keys():
+    return set(server.response_cache.entries)
+
+
+def test_like_refreshes_the_review_but_keeps_feed_pages(api, signup):
+    _, headers = signup()
+    review = create_review(api, headers)
+    api.get("/api/reviews")
+    api.get(f"/api/reviews/{review['id']}")
+    api.get(f"/api/reviews/{review['id']}/comments")
+    assert {"reviews::20:summary", f"review:{review['id']}"} <= cached_keys()
+
+    assert api.post(f"/api/reviews/{review['id']}/like", headers=headers).status_code == 200
+    assert f"review:{review['id']}" not in cached_keys()
+    assert "reviews::20:summary" in cached_keys()
+    assert any(key.startswith(f"comments:{review['id']}:") for key in cached_keys())
+    assert api.get(f"/api/reviews/{review['id']}").json()["likes_count"] == 1
+
+
+def test_comment_drops_only_its_own_thread(api, signup):
+    _, headers = signup()
+    first, second = create_review(api, headers, "Birinci"), create_review(api, headers, "İkinci")
+    for review in (first, second):
+        api.get(f"/api/reviews/{review['id']}/comments")
+    api.get("/api/reviews")
+
+    response = api.post(f"/api/reviews/{first['id']}/comments", headers=headers, json={"content": "Katılıyorum."})
+    assert response.status_code == 200, response.text
+    keys = cached_keys()
+    assert not any(key.startswith(f"comments:{first['id']}:") for key in keys)
+    assert any(key.startswith(f"comments:{second['id']}:") for key in keys)
+    assert "reviews::20:summary" in keys
+    assert [comment["content"] for comment in api.get(f"/api/reviews/{first['id']}/comments").json()] == ["Katılıyorum."]
+
+
+def test_edit_drops_feed_pages_and_the_review(api, signup):
+    _, headers = signup()
+    review = create_review(api, headers)
+    api.get("/api/reviews")
+    api.get(f"/api/reviews/{review['id']}")
+
+    response = api.put(f"/api/reviews/{review['id']}", headers=headers, json={"title": "Yeni başlık"})
+    assert response.status_code == 200, response.text
+    assert not {"reviews::20:summary", f"review:{review['id']}"} & cached_keys()
+    assert api.get("/api/reviews").json()[0]["title"] == "Yeni başlık"
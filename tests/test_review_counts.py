@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_reviews(db, categories):
+    await db.reviews.insert_many([
+        {"id": f"review-{n}", "category": category} for n, category in enumerate(categories)
+    ])
+
+
+async def counts(db):
+    return {doc["_id"]: doc["count"] async for doc in db.review_counts.find({})}
+
+
+async def test_seed_counts_reviews_per_category(db):
+    await seed_reviews(db, ["RPG", "RPG", "FPS"])
+    await server.seed_review_counts()
+    assert await counts(db) == {"RPG": 2, "FPS": 1}
+
+
+async def test_concurrent_seeds_count_each_review_once(db):
+    await seed_reviews(db, ["RPG", "RPG", "FPS"])
+    await asyncio.gather(*[server.seed_review_counts() for _ in range(3)])
+    assert await counts(db) == {"RPG": 2, "FPS": 1}
+
+
+async def test_seed_keeps_counters_written_by_another_worker(db, hook):
+    await seed_reviews(db, ["RPG", "FPS"])
+
+    async def other_worker_first(query, update, **kwargs):
+        # Another worker's seed or $inc upsert created the counter in between
+        if query["_id"] == "RPG":
+            await db.review_counts.update_one({"_id": "RPG"}, {"$inc": {"count": 1}}, upsert=True)
+
+    hook("review_counts", "update_one", other_worker_first)
+    await server.seed_review_counts()
+    assert await counts(db) == {"RPG": 1, "FPS": 1}
+
+
+async def test_seed_survives_losing_the_upsert_race(db, hook):
+    await seed_reviews(db, ["RPG"])
+
+    async def lost_race(query, update, **kwargs):
+        raise DuplicateKeyError("E11000 duplicate key error collection: review_counts index: _id_")
+
+    hook("review_counts", "update_one", lost_race)
+    await server.seed_review_counts()
+
+
+def test_count_route_reads_the_counter(api, signup):
+    _, headers = signup()
+    for category in ("RPG", "RPG", "FPS"):
+        response = api.post("/api/reviews", headers=headers, json={
+            "title": "Başlık", "content": "İçerik metni.", "game_name": "Hades", "category": category
+        })
+        assert response.status_code == 200, response.text
+    assert api.get("/api/reviews/count", params={"category": "RPG"}).json()["count"] == 2
+    assert api.get("/api/reviews/count").json()["count"] == 3
@@ -0,0 +1,41 @@
+def setup_review(api, signup):
+    _, headers = signup()
+    review = api.post("/api/reviews", headers=headers, json={
+        "title": "Başlık", "content": "İçerik metni.", "game_name": "Hades", "category": "RPG"
+    }).json()
+    for n in range(3):
+        api.post(f"/api/reviews/{review['id']}/comments", headers=headers, json={"content": f"Yorum {n}"})
+    api.post(f"/api/reviews/{review['id']}/like", headers=headers)
+    return review, headers
+
+
+def test_page_bundles_review_comments_and_like_state(api, signup):
+    review, headers = setup_review(api, signup)
+    path = f"/api/reviews/{review['id']}"
+    page = api.get(f"{path}/page", params={"limit": 2}, headers=headers).json()
+
+    assert page["review"] == api.get(path).json()
+    assert page["comments"] == api.get(f"{path}/comments", params={"limit": 2}).json()
+    assert page["next_cursor"] == api.get(f"{path}/comments", params={"limit": 2}).headers["x-next-cursor"]
+    assert page["liked"] is True
+
+
+def test_anonymous_callers_get_no_like_state(api, signup):
+    review, _ = setup_review(api, signup)
+    page = api.get(f"/api/reviews/{review['id']}/page").json()
+    assert page["liked"] is None
+    # A stale token reads like an anonymous one
+    page = api.get(f"/api/reviews/{review['id']}/page", headers={"Authorization": "Bearer bozuk"}).json()
+    assert page["liked"] is None
+
+
+def test_include_selects_parts(api, signup):
+    review, _ = setup_review(api, signup)
+    path = f"/api/reviews/{review['id']}/page"
+    assert api.get(path, params={"include": "comments"}).json().keys() == {"comments", "next_cursor"}
+    assert api.get(path, params={"include": "review,yorumlar"}).status_code == 400
+    assert api.get(path, params={"include": ""}).status_code == 400
+
+
+def test_missing_review_is_a_404_whatever_is_included(api):
+    assert api.get("/api/reviews/olmayan/page", params={"include": "comments"}).status_code == 404
@@ -0,0 +1,156 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+import server
+from search_index import MAX_CACHED_PREFIXES, MAX_PREFIX_DOCUMENTS, SearchIndex, fold, tokenize
+
+
+def make_index(titles):
+    index = SearchIndex({"title": 1.0})
+    for position, title in enumerate(titles):
+        index.add(f"r{position}", {"title": title}, sort_key=f"{position:04d}")
+    return index
+
+
+def ids(ranked):
+    return [doc_id for doc_id, _ in ranked]
+
+
+def test_fold_maps_turkish_letters_and_diacritics():
+    assert fold("İSTANBUL") == "istanbul"
+    assert fold("IŞIK") == "isik"
+    assert fold("Çağ Öğüt") == "cag ogut"
+
+
+def test_tokenize_folds_and_splits_words():
+    assert tokenize("Yüzüklerin Efendisi: Savaş!") == ["yuzuklerin", "efendisi", "savas"]
+    assert tokenize(None) == []
+
+
+def test_search_matches_across_diacritics():
+    index = make_index(["Çılgın Yarış", "Sakin Bahçe"])
+    assert ids(index.search("cilgin")) == ["r0"]
+    assert ids(index.search("YARIŞ")) == ["r0"]
+
+
+def test_every_token_must_match():
+    index = make_index(["elden ring incelemesi", "elden kaçan fırsat"])
+    assert ids(index.search("elden ring")) == ["r0"]
+
+
+def test_bm25_ranks_rarer_terms_higher():
+    index = make_index(["zelda zelda macera", "zelda macera", "macera macera"])
+    ranked = index.search("zelda")
+    assert ids(ranked)[0] == "r0"
+    assert set(ids(ranked)) == {"r0", "r1"}
+
+
+def test_equal_scores_rank_newest_first():
+    index = make_index(["aynı başlık", "aynı başlık"])
+    assert ids(index.search("ayni")) == ["r1", "r0"]
+
+
+def test_last_token_is_a_prefix():
+    index = make_index(["karakter gelişimi", "kart oyunu", "harita"])
+    assert set(ids(index.search("kar"))) == {"r0", "r1"}
+    assert ids(index.search("karakter gel")) == ["r0"]
+
+
+def test_short_prefix_keeps_terms_late_in_the_alphabet():
+    titles = [f"ka{n:03d}" for n in range(60)] + ["Karakter"]
+    index = make_index(titles)
+    assert f"r{len(titles) - 1}" in ids(index.search("ka"))
+
+
+def test_prefix_expansion_prefers_the_exact_term_and_common_terms():
+    index = make_index(["kar"] + ["kara"] * 3 + ["karpuz"])
+    expansions = index.expand_prefix("kar")
+    assert expansions[0] == "kar"
+    assert expansions.index("kara") < expansions.index("karpuz")
+
+
+def test_prefix_expansion_is_bounded_by_documents():
+    index = make_index([f"ortak{n}" for n in range(MAX_PREFIX_DOCUMENTS + 10)])
+    assert len(index.expand_prefix("ortak")) == MAX_PREFIX_DOCUMENTS
+
+
+def test_remove_and_readd_update_postings():
+    index = make_index(["eski başlık"])
+    index.add("r0", {"title": "yeni başlık"})
+    assert index.search("eski") == []
+    assert ids(index.search("yeni")) == ["r0"]
+
+    index.remove("r0")
+    assert index.search("baslik") == []
+    assert len(index) == 0
+    assert index.vocabulary == []
+
+
+def test_prefix_expansions_are_cached_until_the_next_write():
+    index = make_index(["kara", "karpuz"])
+    first = index.expand_prefix("kar")
+    assert index.expand_prefix("kar") is first
+
+    index.add("r2", {"title": "karınca"})
+    assert "karinca" in index.expand_prefix("kar")
+    index.remove("r2")
+    assert "karinca" not in index.expand_prefix("kar")
+
+
+def test_prefix_cache_is_bounded():
+    index = make_index(["kara"])
+    for n in range(MAX_CACHED_PREFIXES + 10):
+        index.expand_prefix(f"k{n}")
+    assert len(index.expansions) <= MAX_CACHED_PREFIXES
+
+
+def review_doc(review_id, title):
+    return {"id": review_id, "title": title, "game_name": "Hades", "author_username": "yazar",
+            "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc)}
+
+
+@pytest.mark.anyio
+async def test_rebuild_picks_up_writes_from_other_workers(db):
+    await server.build_search_indexes()
+    # Written by another worker: this worker's index never saw it
+    await db.reviews.insert_one(review_doc("r1", "Başka sunucu"))
+    assert server.review_index.search("baska") == []
+
+    await server.build_search_indexes()
+    assert [doc_id for doc_id, _ in server.review_index.search("baska")] == ["r1"]
+
+
+@pytest.mark.anyio
+async def test_local_writes_during_a_rebuild_survive_the_swap(db, monkeypatch):
+    await db.reviews.insert_many([review_doc("r1", "Eski kayıt"), review_doc("r2", "Silinecek kayıt")])
+    await server.build_search_indexes()
+    scanning = asyncio.Event()
+    resume = asyncio.Event()
+
+    class SlowUsers:
+        async def find(self, *args):
+            scanning.set()
+            await resume.wait()
+            async for user in db.users.find(*args):
+                yield user
+
+    class SlowDb:
+        # Holds the rebuild between the reviews and users scans
+        users = SlowUsers()
+
+        def __getattr__(self, name):
+            return getattr(db, name)
+
+    monkeypatch.setattr(server, "db", SlowDb())
+    rebuild = asyncio.create_task(server.build_search_indexes())
+    await scanning.wait()
+    # Handled here while the rebuild is between collections
+    server.index_review(review_doc("r3", "Yeni kayıt"))
+    server.unindex_review("r2")
+    resume.set()
+    await rebuild
+
+    assert sorted(doc_id for doc_id, _ in server.review_index.search("kayit")) == ["r1", "r3"]
+    assert server.rebuilding_indexes is None